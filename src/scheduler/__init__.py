@@ -3,7 +3,7 @@
 __version__ = "0.1.0"
 
 from scheduler.models import Task, TaskRun, TaskStatus, RetryPolicy, NotifyConfig
-from scheduler.storage import TaskStorage
+from scheduler.storage import TaskStorage, SqliteIndexedStorage
 from scheduler.core import Scheduler
 from scheduler.executor import TaskExecutor
 
@@ -14,6 +14,7 @@ __all__ = [
     "RetryPolicy",
     "NotifyConfig",
     "TaskStorage",
+    "SqliteIndexedStorage",
     "Scheduler",
     "TaskExecutor",
 ]
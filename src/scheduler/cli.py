@@ -2,28 +2,32 @@
 
 from __future__ import annotations
 
-import base64
-import json
+import binascii
 import sys
+from datetime import datetime
+from itertools import islice
 from pathlib import Path
 
 import click
 from colorama import init, Fore, Style
-from croniter import croniter
 
-from scheduler.config import DEFAULT_MCP_HOST, DEFAULT_MCP_PORT
-from scheduler.models import Task, RetryPolicy, NotifyConfig, WebhookConfig
-from scheduler.storage import TaskStorage
+from scheduler.config import DEFAULT_MCP_HOST, DEFAULT_MCP_PORT, SPECIAL_CRONS
+from scheduler.models import (
+    Task,
+    RetryPolicy,
+    NotifyConfig,
+    WebhookConfig,
+    is_valid_cron,
+    iter_history,
+)
+from scheduler.storage import get_storage
 from scheduler.core import Scheduler
 from scheduler.executor import TaskExecutor
+from scheduler.jsonutil import dumps
 
 init(autoreset=True)
 
 
-def get_storage() -> TaskStorage:
-    return TaskStorage()
-
-
 @click.group()
 @click.version_option(version="0.1.0", prog_name="cron-cli")
 def cli() -> None:
@@ -41,7 +45,7 @@ def cli() -> None:
 @click.option("--working-dir", "-w", type=click.Path(), help="Working directory")
 @click.option("--env", "-e", multiple=True, help="Environment variable (KEY=value)")
 @click.option("--retry-max", type=int, default=1, help="Max retry attempts")
-@click.option("--retry-delay", type=int, default=0, help="Retry delay in seconds")
+@click.option("--retry-delay", type=int, default=0, help="Initial retry delay in seconds, doubled per retry")
 @click.option("--priority", type=int, default=5, help="Priority 1-10 (default 5)")
 @click.option("--owner", default="", help="Task owner")
 @click.option("--webhook-url", default="", help="Webhook URL to call after execution")
@@ -69,19 +73,8 @@ def add(
     enabled: bool,
 ) -> None:
     """Add a new scheduled task."""
-    special = {
-        "@yearly": "0 0 1 1 *",
-        "@annually": "0 0 1 1 *",
-        "@monthly": "0 0 1 * *",
-        "@weekly": "0 0 * * 0",
-        "@daily": "0 0 * * *",
-        "@midnight": "0 0 * * *",
-        "@hourly": "0 * * * *",
-        "@reboot": "@reboot",
-    }
-    
-    check_cron = special.get(cron, cron)
-    if check_cron != "@reboot" and not croniter.is_valid(check_cron):
+    check_cron = SPECIAL_CRONS.get(cron, cron)
+    if check_cron != "@reboot" and not is_valid_cron(check_cron):
         click.echo(f"{Fore.RED}Error: Invalid cron expression: {cron}", err=True)
         sys.exit(1)
     
@@ -93,13 +86,15 @@ def add(
         sys.exit(1)
     
     # Parse environment variables
-    env_dict = {}
-    for e in env:
-        if "=" not in e:
-            click.echo(f"{Fore.RED}Error: Invalid environment variable: {e}", err=True)
-            sys.exit(1)
-        key, value = e.split("=", 1)
-        env_dict[key] = f"base64:{base64.b64encode(value.encode()).decode()}"
+    bad_env = next((e for e in env if "=" not in e), None)
+    if bad_env is not None:
+        click.echo(f"{Fore.RED}Error: Invalid environment variable: {bad_env}", err=True)
+        sys.exit(1)
+    
+    env_dict = {
+        key: "base64:" + binascii.b2a_base64(value.encode(), newline=False).decode("ascii")
+        for key, value in (e.split("=", 1) for e in env)
+    }
     
     tag_list = [t.strip() for t in tags.split(",") if t.strip()]
     
@@ -141,28 +136,30 @@ def list(output_json: bool) -> None:
     """List all tasks."""
     storage = get_storage()
     tasks = storage.list_all()
+    now = datetime.now()
     
     if output_json:
-        click.echo(json.dumps([t.to_dict() for t in tasks], indent=2, ensure_ascii=False))
+        click.echo(dumps([t.to_dict(now) for t in tasks], indent=True))
     else:
         if not tasks:
             click.echo("No tasks found.")
             return
         
-        click.echo(f"{'Name':<25} {'Cron':<15} {'Status':<10} {'Next Run'}")
-        click.echo("-" * 70)
+        lines = [f"{'Name':<25} {'Cron':<15} {'Status':<10} {'Next Run'}", "-" * 70]
         
         for task in tasks:
             status = f"{Fore.GREEN}enabled" if task.enabled else f"{Fore.RED}disabled"
-            next_run = task.get_next_run()
+            next_run = task.get_next_run(now=now)
             next_run_str = next_run.strftime("%m-%d %H:%M") if next_run else "N/A"
             cron_disp = task.cron if len(task.cron) <= 14 else task.cron[:11] + "..."
-            click.echo(
+            lines.append(
                 f"{task.name[:24]:<25} "
                 f"{cron_disp:<15} "
                 f"{status:<10} "
                 f"{Style.RESET_ALL}{next_run_str}"
             )
+        
+        click.echo("\n".join(lines))
 
 
 @cli.command()
@@ -195,73 +192,76 @@ def get(name: str, output_json: bool) -> None:
         sys.exit(1)
     
     if output_json:
-        click.echo(json.dumps(task.to_dict(), indent=2, ensure_ascii=False))
+        click.echo(dumps(task.to_dict(), indent=True))
     else:
         # Display detailed task information
-        click.echo(f"{Style.BRIGHT}Task: {task.name}{Style.RESET_ALL}")
-        click.echo(f"{'─' * 50}")
+        lines: list[str] = []
+        lines.append(f"{Style.BRIGHT}Task: {task.name}{Style.RESET_ALL}")
+        lines.append(f"{'─' * 50}")
         
         # Basic info
-        click.echo(f"{Fore.CYAN}Basic{Style.RESET_ALL}")
-        click.echo(f"  Cron:       {task.cron}")
+        lines.append(f"{Fore.CYAN}Basic{Style.RESET_ALL}")
+        lines.append(f"  Cron:       {task.cron}")
         status = f"{Fore.GREEN}enabled" if task.enabled else f"{Fore.RED}disabled"
-        click.echo(f"  Status:     {status}")
-        click.echo(f"  Command:    {task.command}")
+        lines.append(f"  Status:     {status}{Style.RESET_ALL}")
+        lines.append(f"  Command:    {task.command}")
         
         if task.description:
-            click.echo(f"  Description: {task.description}")
+            lines.append(f"  Description: {task.description}")
         
         # Schedule info
         next_run = task.get_next_run()
         if next_run:
-            click.echo(f"\n{Fore.CYAN}Schedule{Style.RESET_ALL}")
-            click.echo(f"  Next run:   {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
+            lines.append(f"\n{Fore.CYAN}Schedule{Style.RESET_ALL}")
+            lines.append(f"  Next run:   {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
         
         # Metadata
-        click.echo(f"\n{Fore.CYAN}Metadata{Style.RESET_ALL}")
+        lines.append(f"\n{Fore.CYAN}Metadata{Style.RESET_ALL}")
         if task.tags:
-            click.echo(f"  Tags:       {', '.join(task.tags)}")
-        click.echo(f"  Priority:   {task.priority}")
+            lines.append(f"  Tags:       {', '.join(task.tags)}")
+        lines.append(f"  Priority:   {task.priority}")
         if task.owner:
-            click.echo(f"  Owner:      {task.owner}")
+            lines.append(f"  Owner:      {task.owner}")
         
         # Execution settings
-        click.echo(f"\n{Fore.CYAN}Execution{Style.RESET_ALL}")
-        click.echo(f"  Timeout:    {task.timeout}s" if task.timeout > 0 else "  Timeout:    no limit")
+        lines.append(f"\n{Fore.CYAN}Execution{Style.RESET_ALL}")
+        lines.append(f"  Timeout:    {task.timeout}s" if task.timeout > 0 else "  Timeout:    no limit")
         if task.retry:
-            click.echo(f"  Retry:      {task.retry.max_attempts} attempts, {task.retry.delay}s delay")
+            lines.append(f"  Retry:      {task.retry.max_attempts} attempts, {task.retry.delay}s delay")
         if task.working_dir:
-            click.echo(f"  Working dir: {task.working_dir}")
+            lines.append(f"  Working dir: {task.working_dir}")
         
         if task.webhook and task.webhook.url:
-            click.echo(f"\n{Fore.CYAN}Webhook{Style.RESET_ALL}")
-            click.echo(f"  URL:        {task.webhook.url}")
+            lines.append(f"\n{Fore.CYAN}Webhook{Style.RESET_ALL}")
+            lines.append(f"  URL:        {task.webhook.url}")
             if task.webhook.token:
-                click.echo(f"  Token:      {task.webhook.token[:8]}..." if len(task.webhook.token) > 8 else f"  Token:      {task.webhook.token}")
-            click.echo(f"  On success: {task.webhook.on_success}")
-            click.echo(f"  On failure: {task.webhook.on_failure}")
+                lines.append(f"  Token:      {task.webhook.token[:8]}..." if len(task.webhook.token) > 8 else f"  Token:      {task.webhook.token}")
+            lines.append(f"  On success: {task.webhook.on_success}")
+            lines.append(f"  On failure: {task.webhook.on_failure}")
         
         # Environment variables (show keys only, values are base64 encoded)
         if task.environment:
-            click.echo(f"\n{Fore.CYAN}Environment{Style.RESET_ALL}")
+            lines.append(f"\n{Fore.CYAN}Environment{Style.RESET_ALL}")
             for key in task.environment:
-                click.echo(f"  {key}")
+                lines.append(f"  {key}")
         
         # Timestamps
-        click.echo(f"\n{Fore.CYAN}Timestamps{Style.RESET_ALL}")
-        click.echo(f"  Created:    {task.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
+        lines.append(f"\n{Fore.CYAN}Timestamps{Style.RESET_ALL}")
+        lines.append(f"  Created:    {task.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
         if task.updated_at:
-            click.echo(f"  Updated:    {task.updated_at.strftime('%Y-%m-%d %H:%M:%S')}")
+            lines.append(f"  Updated:    {task.updated_at.strftime('%Y-%m-%d %H:%M:%S')}")
         
         # Recent runs
         if task.runs:
-            click.echo(f"\n{Fore.CYAN}Recent Runs{Style.RESET_ALL}")
-            click.echo(f"  {'Time':<20} {'Exit':<6} {'Webhook':<12} {'Output'}")
-            click.echo(f"  {'─' * 60}")
-            for run in task.runs[:5]:
+            lines.append(f"\n{Fore.CYAN}Recent Runs{Style.RESET_ALL}")
+            lines.append(f"  {'Time':<20} {'Exit':<6} {'Webhook':<12} {'Output'}")
+            lines.append(f"  {'─' * 60}")
+            for run in islice(reversed(task.runs), 5):
                 output = run.stdout[:20].replace('\n', ' ') + "..." if len(run.stdout) > 20 else run.stdout
                 webhook_status = f"{run.webhook_status}" if run.webhook_called else "-"
-                click.echo(f"  {run.started_at.strftime('%Y-%m-%d %H:%M:%S'):<20} {run.exit_code:<6} {webhook_status:<12} {output}")
+                lines.append(f"  {run.started_at.strftime('%Y-%m-%d %H:%M:%S'):<20} {run.exit_code:<6} {webhook_status:<12} {output}")
+        
+        click.echo("\n".join(lines))
 
 
 @cli.command()
@@ -280,34 +280,35 @@ def logs(task: str | None, output_json: bool) -> None:
     else:
         tasks = storage.list_all()
     
-    history = []
-    for t in tasks:
-        for run in t.runs:
-            history.append({
-                "task": t.name,
-                "executed_at": run.started_at.isoformat(),
-                "exit_code": run.exit_code,
-                "output": run.stdout + (f"\n{run.stderr}" if run.stderr else ""),
-            })
+    history = [
+        {
+            "task": t.name,
+            "executed_at": run.started_at.isoformat(),
+            "exit_code": run.exit_code,
+            "output": run.stdout + (f"\n{run.stderr}" if run.stderr else ""),
+        }
+        for t, run in iter_history(tasks)
+    ]
     
     if output_json:
-        click.echo(json.dumps(history, indent=2, ensure_ascii=False))
+        click.echo(dumps(history, indent=True))
     else:
         if not history:
             click.echo("No execution history.")
             return
         
-        click.echo(f"{'Task':<25} {'Time':<20} {'Exit':<6} {'Output'}")
-        click.echo("-" * 80)
+        lines = [f"{'Task':<25} {'Time':<20} {'Exit':<6} {'Output'}", "-" * 80]
         
         for item in history:
             output = item['output'][:40].replace('\n', ' ') + "..." if len(item['output']) > 40 else item['output']
-            click.echo(
+            lines.append(
                 f"{item['task'][:24]:<25} "
                 f"{item['executed_at'][:19]:<20} "
                 f"{item['exit_code']:<6} "
                 f"{output}"
             )
+        
+        click.echo("\n".join(lines))
 
 
 @cli.command()
@@ -316,21 +317,14 @@ def logs(task: str | None, output_json: bool) -> None:
 @click.option("--mcp-port", type=int, default=DEFAULT_MCP_PORT, help="MCP server port")
 def start(mcp: bool, mcp_host: str, mcp_port: int) -> None:
     """Start the scheduler daemon."""
-    import subprocess
-    import sys
-    
     # Check if already running
     from scheduler.config import PID_FILE
-    if PID_FILE.exists():
-        try:
-            pid = int(PID_FILE.read_text().strip())
-            # Check if process exists
-            import os
-            os.kill(pid, 0)
-            click.echo(f"{Fore.YELLOW}Scheduler is already running (PID: {pid})")
-            return
-        except (ValueError, OSError, ProcessLookupError):
-            PID_FILE.unlink(missing_ok=True)
+    from scheduler.daemon import read_pid
+    pid = read_pid()
+    if pid is not None:
+        click.echo(f"{Fore.YELLOW}Scheduler is already running (PID: {pid})")
+        return
+    PID_FILE.unlink(missing_ok=True)
     
     click.echo(f"{Fore.GREEN}Starting scheduler...")
     
@@ -339,24 +333,63 @@ def start(mcp: bool, mcp_host: str, mcp_port: int) -> None:
     if mcp:
         cmd.extend(["--mcp", "--mcp-host", mcp_host, "--mcp-port", str(mcp_port)])
     
-    subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _spawn_detached(cmd)
     
     click.echo(f"{Fore.GREEN}✓ Scheduler started")
     if mcp:
         click.echo(f"  MCP server: http://{mcp_host}:{mcp_port}/sse")
 
 
+def _spawn_detached(cmd: list[str]) -> None:
+    """Start a command detached from this process and its terminal."""
+    import os
+    import subprocess
+    
+    if not hasattr(os, "fork"):
+        flags = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            creationflags=flags,
+        )
+        return
+    
+    sys.stdout.flush()
+    sys.stderr.flush()
+    
+    if os.fork() != 0:
+        return
+    
+    # Child: new session without a controlling terminal, then become the daemon
+    try:
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        os.execvp(cmd[0], cmd)
+    finally:
+        os._exit(127)
+
+
 @cli.command()
 def stop() -> None:
     """Stop the scheduler daemon."""
     from scheduler.config import PID_FILE
+    from scheduler.daemon import read_pid
     
     if not PID_FILE.exists():
         click.echo(f"{Fore.YELLOW}Scheduler is not running")
         return
     
+    pid = read_pid()
+    if pid is None:
+        click.echo(f"{Fore.YELLOW}Scheduler is not running (stale PID file)")
+        PID_FILE.unlink(missing_ok=True)
+        return
+    
     try:
-        pid = int(PID_FILE.read_text().strip())
         import os
         import signal
         os.kill(pid, signal.SIGTERM)
@@ -371,14 +404,13 @@ def stop() -> None:
 def status() -> None:
     """View scheduler status."""
     from scheduler.config import PID_FILE
+    from scheduler.daemon import read_pid
     
     if PID_FILE.exists():
-        try:
-            pid = int(PID_FILE.read_text().strip())
-            import os
-            os.kill(pid, 0)
+        pid = read_pid()
+        if pid is not None:
             click.echo(f"{Fore.GREEN}Scheduler is running (PID: {pid})")
-        except (OSError, ProcessLookupError):
+        else:
             click.echo(f"{Fore.RED}Scheduler is not running (stale PID file)")
             PID_FILE.unlink(missing_ok=True)
     else:
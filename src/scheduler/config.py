@@ -1,6 +1,7 @@
 """Configuration and constants for the scheduler."""
 
 from pathlib import Path
+from types import MappingProxyType
 
 DATA_DIR = Path.home() / ".config" / "cron-scheduler"
 TASKS_DIR = DATA_DIR / "tasks"
@@ -11,3 +12,16 @@ DEFAULT_MCP_HOST = "0.0.0.0"
 DEFAULT_MCP_PORT = 8000
 DEFAULT_CHECK_INTERVAL = 1
 DEFAULT_MAX_HISTORY = 50
+MAX_OUTPUT_CHARS = 10000
+RETRY_MAX_DELAY = 3600
+MAX_RETRYING_TASKS = 256
+
+SPECIAL_CRONS = MappingProxyType({
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+})
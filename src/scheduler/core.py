@@ -3,15 +3,18 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
+import time
 from datetime import datetime
 from typing import Callable
 
 from croniter import croniter
 
+from scheduler import cronexpr
 from scheduler.config import DEFAULT_CHECK_INTERVAL
 from scheduler.executor import TaskExecutor
-from scheduler.models import Task, TaskRun, TaskStatus
+from scheduler.models import Task, TaskRun, TaskStatus, is_valid_cron
 from scheduler.storage import TaskStorage
 
 logger = logging.getLogger(__name__)
@@ -38,6 +41,18 @@ class Scheduler:
         self._started_at: datetime | None = None
         self._run_count = 0
         self._reboot_tasks_executed: set[str] = set()
+        # task name -> (canonical schedule, last_run, next fire epoch) for the last
+        # computed schedule
+        self._next_run_cache: dict[str, tuple[str, datetime | None, float]] = {}
+        # min-heap of (next fire epoch, task name); stale entries are skipped on pop
+        self._heap: list[tuple[float, str]] = []
+        self._scheduled: dict[str, Task] = {}
+        self._storage_revision: int | None = None
+        # time.monotonic() of the last storage refresh
+        self._last_refresh: float | None = None
+        # Created in start(): before Python 3.10 an Event binds to the loop current
+        # at construction, which may not be the one that runs the scheduler
+        self._wakeup: asyncio.Event | None = None
     
     async def start(self) -> None:
         """Start the scheduler loop."""
@@ -46,6 +61,7 @@ class Scheduler:
         
         self._running = True
         self._started_at = datetime.now()
+        self._wakeup = asyncio.Event()
         
         logger.info("Scheduler started")
         
@@ -59,7 +75,7 @@ class Scheduler:
                 except Exception as e:
                     logger.error(f"Error in scheduler loop: {e}")
             
-            await asyncio.sleep(self.check_interval)
+            await self._sleep_until_next_fire()
     
     def stop(self) -> None:
         """Stop the scheduler."""
@@ -74,8 +90,27 @@ class Scheduler:
     def resume(self) -> None:
         """Resume the scheduler."""
         self._paused = False
+        self._wake()
         logger.info("Scheduler resumed")
     
+    def reload_task(self, name: str) -> None:
+        """Re-read a task from storage and reschedule it after an add/edit/remove."""
+        self._next_run_cache.pop(name, None)
+        task = self.storage.load(name)
+        
+        if task is None or not task.enabled or task.cron == "@reboot":
+            self._scheduled.pop(name, None)
+        else:
+            self._scheduled[name] = task
+            self._push_next_fire(task)
+        
+        self._wake()
+    
+    def _wake(self) -> None:
+        """Wake the scheduler loop early, if it is running."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+    
     async def _execute_reboot_tasks(self) -> None:
         """Execute @reboot tasks once."""
         tasks = self.storage.list_enabled()
@@ -87,45 +122,113 @@ class Scheduler:
                 self._reboot_tasks_executed.add(task.name)
     
     async def _check_and_run_tasks(self) -> None:
-        """Check for tasks that need to run."""
-        now = datetime.now()
-        tasks = self.storage.list_enabled()
+        """Run every task whose next fire time has been reached."""
+        self._sync_schedule()
         
-        for task in tasks:
+        now = time.time()
+        
+        while self._heap and self._heap[0][0] <= now:
+            _, name = heapq.heappop(self._heap)
+            task = self._scheduled.get(name)
+            
+            # Entries left behind by a reschedule or removal are simply dropped
+            if task is None or not self._should_run_task(task, now):
+                continue
+            
+            # A running task is pushed back onto the heap by _run_task when it finishes
+            if name in self._tasks and not self._tasks[name].done():
+                continue
+            
+            logger.info(f"Task '{name}' scheduled to run")
+            self._tasks[name] = asyncio.create_task(self._run_task(task))
+    
+    def _sync_schedule(self) -> None:
+        """Rebuild the heap when the stored tasks changed since the last sync."""
+        # Rescanning stats every task file, so out-of-process edits are looked
+        # for once per check_interval rather than on every wakeup
+        now = time.monotonic()
+        if self._last_refresh is None or now - self._last_refresh >= self.check_interval:
+            self._last_refresh = now
+            try:
+                self.storage.refresh()
+            except OSError:
+                return
+        
+        revision = self.storage.revision
+        if revision == self._storage_revision:
+            return
+        
+        self._storage_revision = revision
+        self._heap = []
+        scheduled: dict[str, Task] = {}
+        
+        for task in self.storage.list_enabled():
             if task.cron == "@reboot":
                 continue
             
-            if self._should_run_task(task, now):
-                logger.info(f"Task '{task.name}' scheduled to run")
-                
-                if task.name not in self._tasks or self._tasks[task.name].done():
-                    self._tasks[task.name] = asyncio.create_task(
-                        self._run_task(task)
-                    )
-    
-    def _should_run_task(self, task: Task, now: datetime) -> bool:
-        """Check if a task should run."""
-        special = {
-            "@yearly": "0 0 1 1 *",
-            "@annually": "0 0 1 1 *",
-            "@monthly": "0 0 1 * *",
-            "@weekly": "0 0 * * 0",
-            "@daily": "0 0 * * *",
-            "@midnight": "0 0 * * *",
-            "@hourly": "0 * * * *",
-        }
+            running = self._tasks.get(task.name)
+            if running is not None and not running.done():
+                scheduled[task.name] = self._scheduled.get(task.name, task)
+                continue
+            
+            scheduled[task.name] = task
+            self._push_next_fire(task)
         
-        schedule = special.get(task.cron, task.cron)
+        self._scheduled = scheduled
+    
+    def _push_next_fire(self, task: Task) -> None:
+        """Push the task's next fire time onto the heap."""
+        next_fire = self._get_next_fire(task)
+        if next_fire is not None:
+            heapq.heappush(self._heap, (next_fire, task.name))
+    
+    async def _sleep_until_next_fire(self) -> None:
+        """Sleep until the head of the heap is due, a reload, or the storage poll."""
+        # check_interval only bounds how quickly out-of-process edits are noticed
+        timeout = float(self.check_interval)
+        if self._heap and not self._paused:
+            timeout = min(timeout, max(0.0, self._heap[0][0] - time.time()))
         
         try:
-            base_time = task.last_run or datetime(1970, 1, 1)
-            itr = croniter(schedule, base_time)
-            next_run = itr.get_next(datetime)
-            
-            return now >= next_run
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+    
+    def _should_run_task(self, task: Task, now: float) -> bool:
+        """Check if a task should run at the given epoch time."""
+        next_fire = self._get_next_fire(task)
+        return next_fire is not None and now >= next_fire
+    
+    def _get_next_fire(self, task: Task) -> float | None:
+        """Get the task's next fire epoch after its last run, cached per task."""
+        schedule = task.effective_cron
+        
+        cached = self._next_run_cache.get(task.name)
+        if cached is not None and cached[0] == schedule and cached[1] == task.last_run:
+            return cached[2]
+        
+        if not is_valid_cron(schedule):
+            logger.error(f"Invalid cron expression for task {task.name}: {task.cron}")
+            return None
+        
+        base_time = task.last_run or datetime(1970, 1, 1)
+        
+        try:
+            # Plain expressions are answered from pre-expanded field masks
+            fields = cronexpr.parse_cron(schedule)
+            next_run = cronexpr.next_fire(fields, base_time) if fields is not None else None
+            if next_run is None:
+                next_run = croniter(schedule, base_time).get_next(datetime)
+            # Fire times are naive local wall-clock values; croniter's float results
+            # would treat them as UTC, so convert with datetime.timestamp() instead
+            next_fire = next_run.timestamp()
         except Exception as e:
             logger.error(f"Error parsing cron for task {task.name}: {e}")
-            return False
+            return None
+        
+        self._next_run_cache[task.name] = (schedule, task.last_run, next_fire)
+        return next_fire
     
     async def _run_task(self, task: Task) -> None:
         """Execute a single task."""
@@ -145,8 +248,27 @@ class Scheduler:
             run.finished_at = datetime.now()
             logger.error(f"Task '{task.name}' execution error: {e}")
         
+        # Listed tasks are shared with the storage index, so the run is recorded
+        # on a copy that only reaches storage through save()
+        task = task.model_copy(deep=True)
         task.add_run(run)
-        self.storage.save(task)
+        self._next_run_cache.pop(task.name, None)
+        
+        # When the heap was in sync, a save of our own does not need a rebuild
+        synced = self.storage.revision == self._storage_revision
+        try:
+            self.storage.save(task)
+        except Exception as e:
+            logger.error(f"Failed to save task '{task.name}': {e}")
+        else:
+            if synced:
+                self._storage_revision = self.storage.revision
+        
+        # The heap entry was popped when the run started; push the next one even
+        # if the save failed, or the task would drop off the schedule
+        if task.name in self._scheduled:
+            self._scheduled[task.name] = task
+            self._push_next_fire(task)
         
         if self.on_task_run:
             try:
@@ -183,6 +305,7 @@ class Scheduler:
             
             task.add_run(run)
             self.storage.save(task)
+            self.reload_task(name)
             
         except Exception as e:
             run.status = TaskStatus.FAILED
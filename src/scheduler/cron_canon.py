@@ -0,0 +1,74 @@
+"""Canonical form of cron expressions, used as a cache key.
+
+Equivalent spellings such as ``0,15,30,45 * * * *`` and ``*/15 * * * *``, or
+``0 0 * * 7`` and ``0 0 * * 0``, map to the same string so schedule caches are
+shared between them. The canonical form is only ever used as a key; tasks keep
+the expression their owner wrote.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Iterable
+
+from scheduler.cronexpr import FIELD_RANGES, day_stars, expand_field
+
+
+def _compact(values: Iterable[int]) -> str:
+    """Render sorted values as a list, collapsing runs of three or more into ranges."""
+    parts = []
+    run: list[int] = []
+
+    for value in sorted(values):
+        if run and value == run[-1] + 1:
+            run.append(value)
+            continue
+        if run:
+            parts.append(_render_run(run))
+        run = [value]
+
+    if run:
+        parts.append(_render_run(run))
+
+    return ",".join(parts)
+
+
+def _render_run(run: list[int]) -> str:
+    if len(run) >= 3:
+        return f"{run[0]}-{run[-1]}"
+    return ",".join(str(v) for v in run)
+
+
+@lru_cache(maxsize=1024)
+def canonicalize(expr: str) -> str:
+    """Get the canonical form of a cron expression.
+
+    Expressions the fast path cannot expand (names, ``L``, ``W``, ``#``, special
+    aliases) are returned with whitespace normalized only.
+    """
+    fields = expr.split()
+    if len(fields) != 5:
+        return " ".join(fields)
+
+    expanded = []
+    for field, (low, high) in zip(fields, FIELD_RANGES):
+        values = expand_field(field, low, high)
+        if not values:
+            return " ".join(fields)
+        expanded.append(values)
+
+    # Sunday may be written as 7
+    if 7 in expanded[4]:
+        expanded[4] = (expanded[4] - {7}) | {0}
+
+    domains = [set(range(low, high + 1)) for low, high in FIELD_RANGES]
+    domains[4] = set(range(0, 7))
+    full = [values == domain for values, domain in zip(expanded, domains)]
+
+    # A full day field only reads as "*" in the cases croniter treats it as one,
+    # since that decides whether the two day fields are OR-ed
+    full[2], full[4] = day_stars(fields[2], fields[4], full[2], full[4])
+
+    canonical = ["*" if is_full else _compact(values) for values, is_full in zip(expanded, full)]
+
+    return " ".join(canonical)
@@ -0,0 +1,220 @@
+"""Fast path for plain five-field cron expressions.
+
+Expressions made only of numbers, ``*``, ranges, steps and lists are expanded
+once into one integer bitmask per field (bit ``n`` set when value ``n``
+matches), so matching a time is five bit tests and finding the next matching
+hour or minute is a shift and a lowest-set-bit lookup. The days of a month that
+satisfy both day fields are combined into one mask per month, so the search
+for the next fire time jumps straight to the next matching day.
+
+Anything else (names, ``L``, ``W``, ``#``, ``?``, a seconds field) makes
+:func:`parse_cron` return None and callers fall back to croniter.
+"""
+
+from __future__ import annotations
+
+import calendar
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import FrozenSet, Iterable, NamedTuple
+
+# (min, max) of each field: minute, hour, day of month, month, day of week
+FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+# Give up after searching this many years ahead; croniter then decides whether
+# the expression can ever fire
+_MAX_SEARCH_YEARS = 8
+
+
+class CronFields(NamedTuple):
+    # Bitmasks of matching values; weekdays use 0 for Sunday
+    minutes: int
+    hours: int
+    days: int
+    months: int
+    weekdays: int
+    # cron matches day-of-month OR day-of-week when both are restricted
+    # (see day_stars)
+    day_or: bool
+
+
+def expand_field(field: str, low: int, high: int) -> FrozenSet[int] | None:
+    """Expand one cron field into the set of values it matches."""
+    values: set[int] = set()
+
+    for item in field.split(","):
+        step = 1
+        stepped = "/" in item
+        if stepped:
+            item, step_str = item.split("/", 1)
+            if not step_str.isdigit() or int(step_str) == 0:
+                return None
+            step = int(step_str)
+
+        if item == "*":
+            start, end = low, high
+        elif "-" in item:
+            start_str, end_str = item.split("-", 1)
+            if not start_str.isdigit() or not end_str.isdigit():
+                return None
+            start, end = int(start_str), int(end_str)
+        elif item.isdigit():
+            start = int(item)
+            # "N/step" runs from N to the top of the range, even when step is 1
+            end = high if stepped else start
+        else:
+            return None
+
+        if start < low or end > high or start > end:
+            return None
+
+        values.update(range(start, end + 1, step))
+
+    return frozenset(values)
+
+
+@lru_cache(maxsize=1024)
+def parse_cron(expr: str) -> CronFields | None:
+    """Parse a plain five-field cron expression, or return None if unsupported."""
+    fields = expr.split()
+    if len(fields) != 5:
+        return None
+
+    expanded = []
+    for field, (low, high) in zip(fields, FIELD_RANGES):
+        values = expand_field(field, low, high)
+        if not values:
+            return None
+        expanded.append(values)
+
+    minutes, hours, days, months, weekdays = (_to_mask(values) for values in expanded)
+    # Sunday may be written as 7
+    if weekdays & (1 << 7):
+        weekdays = (weekdays & ~(1 << 7)) | 1
+
+    day_star, weekday_star = day_stars(
+        fields[2], fields[4], days == _ALL_DAYS, weekdays == _ALL_WEEKDAYS
+    )
+
+    return CronFields(
+        minutes=minutes,
+        hours=hours,
+        days=days,
+        months=months,
+        weekdays=weekdays,
+        day_or=not day_star and not weekday_star,
+    )
+
+
+def day_stars(
+    day_field: str, weekday_field: str, days_full: bool, weekdays_full: bool
+) -> tuple[bool, bool]:
+    """Tell which of the day-of-month and day-of-week fields count as ``*``.
+
+    Follows croniter: a day field counts as ``*`` when written as ``*``, or when
+    it covers every value and the other day field contains a ``*``. The two
+    fields are OR-ed only when neither counts as ``*``.
+    """
+    day_star = day_field == "*" or (days_full and "*" in weekday_field)
+    weekday_star = weekday_field == "*" or (weekdays_full and "*" in day_field)
+    return day_star, weekday_star
+
+
+def _to_mask(values: Iterable[int]) -> int:
+    mask = 0
+    for value in values:
+        mask |= 1 << value
+    return mask
+
+
+_ALL_DAYS = _to_mask(range(1, 32))
+_ALL_WEEKDAYS = _to_mask(range(0, 7))
+
+
+def _next_bit(mask: int, after: int) -> int | None:
+    """Get the lowest set bit of mask above position after, or None."""
+    rest = mask >> (after + 1)
+    if not rest:
+        return None
+    return after + (rest & -rest).bit_length()
+
+
+def _day_matches(fields: CronFields, dt: datetime) -> bool:
+    """Check the day-of-month and day-of-week fields against a date."""
+    in_days = fields.days >> dt.day & 1
+    in_weekdays = fields.weekdays >> (dt.isoweekday() % 7) & 1
+
+    if fields.day_or:
+        return in_days or in_weekdays
+    return in_days and in_weekdays
+
+
+def matches(fields: CronFields, dt: datetime) -> bool:
+    """Check whether a time falls on one of the expression's minutes."""
+    return bool(
+        fields.minutes >> dt.minute & 1
+        and fields.hours >> dt.hour & 1
+        and fields.months >> dt.month & 1
+        and _day_matches(fields, dt)
+    )
+
+
+@lru_cache(maxsize=4096)
+def _month_days(days: int, weekdays: int, day_or: bool, year: int, month: int) -> int:
+    """Get the bitmask of days in a month matching both day fields."""
+    first_weekday, length = calendar.monthrange(year, month)
+    # calendar counts weekdays from Monday; cron from Sunday
+    weekday = (first_weekday + 1) % 7
+
+    on_weekdays = 0
+    for day in range(1, length + 1):
+        if weekdays >> weekday & 1:
+            on_weekdays |= 1 << day
+        weekday = (weekday + 1) % 7
+
+    on_days = days & ((1 << (length + 1)) - 2)
+    return on_days | on_weekdays if day_or else on_days & on_weekdays
+
+
+def _first_of_next_month(dt: datetime) -> datetime:
+    if dt.month == 12:
+        return dt.replace(year=dt.year + 1, month=1, day=1, hour=0, minute=0)
+    return dt.replace(month=dt.month + 1, day=1, hour=0, minute=0)
+
+
+def next_fire(fields: CronFields, after: datetime) -> datetime | None:
+    """Get the first matching minute strictly after a time.
+
+    Returns None if nothing matches within the search horizon.
+    """
+    dt = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    last_year = dt.year + _MAX_SEARCH_YEARS
+
+    while dt.year <= last_year:
+        if not fields.months >> dt.month & 1:
+            dt = _first_of_next_month(dt)
+            continue
+
+        month_days = _month_days(fields.days, fields.weekdays, fields.day_or, dt.year, dt.month)
+        if not month_days >> dt.day & 1:
+            day = _next_bit(month_days, dt.day)
+            if day is not None:
+                dt = dt.replace(day=day, hour=0, minute=0)
+            else:
+                dt = _first_of_next_month(dt)
+        elif not fields.hours >> dt.hour & 1:
+            hour = _next_bit(fields.hours, dt.hour)
+            if hour is not None:
+                dt = dt.replace(hour=hour, minute=0)
+            else:
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+        elif not fields.minutes >> dt.minute & 1:
+            minute = _next_bit(fields.minutes, dt.minute)
+            if minute is not None:
+                dt = dt.replace(minute=minute)
+            else:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+        else:
+            return dt
+
+    return None
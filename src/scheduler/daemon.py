@@ -10,11 +10,21 @@ import platform
 import signal
 import sys
 from pathlib import Path
+from typing import Any, Coroutine
 
 from scheduler.config import PID_FILE, LOG_FILE, DEFAULT_MCP_HOST, DEFAULT_MCP_PORT
 from scheduler.core import Scheduler
 from scheduler.executor import TaskExecutor
-from scheduler.storage import TaskStorage
+from scheduler.storage import get_storage
+from scheduler.webhooks import dispatcher as webhook_dispatcher
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - depends on the environment
+    psutil = None
+
+# Allowed drift between the recorded and the reported process start time
+_START_TIME_TOLERANCE = 1.0
 
 
 _shutdown_requested = False
@@ -38,10 +48,94 @@ def setup_logging() -> None:
     )
 
 
+def _import_uvloop() -> Any:
+    """Import uvloop if it is available and supported (POSIX only)."""
+    if platform.system() == "Windows":
+        return None
+    
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop
+
+
+def run_event_loop(main: Coroutine[Any, Any, None]) -> None:
+    """Run a coroutine to completion, on a uvloop loop when it is available."""
+    uvloop = _import_uvloop()
+    if uvloop is None:
+        asyncio.run(main)
+    elif sys.version_info >= (3, 11):
+        # Pass the loop in directly; swapping the global policy is deprecated
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            runner.run(main)
+    else:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        asyncio.run(main)
+
+
+def install_pidfd_child_watcher() -> bool:
+    """Reap task subprocesses through pidfds on Linux.
+    
+    Python 3.12+ and uvloop already do this on their own; older versions
+    default to a thread per child. Must be called from the running loop.
+    """
+    if sys.version_info >= (3, 12) or not hasattr(asyncio, "PidfdChildWatcher"):
+        return False
+    
+    loop = asyncio.get_running_loop()
+    if not isinstance(loop, asyncio.SelectorEventLoop):
+        return False
+    
+    # pidfd_open needs Linux 5.3+
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+    except OSError:
+        return False
+    
+    watcher = asyncio.PidfdChildWatcher()
+    watcher.attach_loop(loop)
+    asyncio.set_child_watcher(watcher)
+    return True
+
+
 def write_pid() -> None:
-    """Write PID to file."""
+    """Write PID (and process start time, when psutil is available) to file."""
     PID_FILE.parent.mkdir(parents=True, exist_ok=True)
-    PID_FILE.write_text(str(os.getpid()))
+    
+    content = str(os.getpid())
+    if psutil is not None:
+        content += f"\n{psutil.Process().create_time()!r}"
+    PID_FILE.write_text(content)
+
+
+def read_pid() -> int | None:
+    """Get the PID of the running daemon, or None if it is not running.
+    
+    When the PID file records a start time, a process with the same PID but a
+    different start time is a recycled PID and counts as not running.
+    """
+    try:
+        fields = PID_FILE.read_text().split()
+        pid = int(fields[0])
+        started = float(fields[1]) if len(fields) > 1 else None
+    except (OSError, ValueError, IndexError):
+        return None
+    
+    if psutil is not None:
+        try:
+            create_time = psutil.Process(pid).create_time()
+        except psutil.Error:
+            return None
+        if started is not None and abs(create_time - started) > _START_TIME_TOLERANCE:
+            return None
+        return pid
+    
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return None
+    return pid
 
 
 def remove_pid() -> None:
@@ -62,7 +156,7 @@ class SchedulerDaemon:
         self.mcp_host = mcp_host
         self.mcp_port = mcp_port
         
-        self.storage = TaskStorage()
+        self.storage = get_storage()
         self.scheduler = Scheduler(self.storage)
         self.mcp_server = None
         self._shutdown_event = asyncio.Event()
@@ -73,10 +167,14 @@ class SchedulerDaemon:
             for sig in (signal.SIGINT, signal.SIGTERM):
                 signal.signal(sig, _signal_handler)
         else:
+            loop = asyncio.get_running_loop()
             for sig in (signal.SIGINT, signal.SIGTERM):
-                asyncio.get_event_loop().add_signal_handler(
-                    sig, lambda: asyncio.create_task(self.shutdown())
-                )
+                loop.add_signal_handler(sig, self._request_shutdown)
+    
+    def _request_shutdown(self) -> None:
+        """Schedule shutdown from a signal handler (POSIX)."""
+        if not self._shutdown_event.is_set():
+            asyncio.get_running_loop().create_task(self.shutdown())
 
     async def start(self) -> None:
         """Start the daemon."""
@@ -86,6 +184,7 @@ class SchedulerDaemon:
         logger = logging.getLogger(__name__)
         
         self._setup_signal_handlers()
+        install_pidfd_child_watcher()
         
         tasks = [asyncio.create_task(self.scheduler.start())]
         
@@ -139,6 +238,8 @@ class SchedulerDaemon:
         logger.info("Shutting down scheduler daemon...")
         
         self.scheduler.stop()
+        await webhook_dispatcher.join(timeout=10)
+        webhook_dispatcher.close()
         remove_pid()
         
         self._shutdown_event.set()
@@ -159,7 +260,7 @@ def main() -> None:
         mcp_port=args.mcp_port,
     )
     
-    asyncio.run(daemon.start())
+    run_event_loop(daemon.start())
 
 
 if __name__ == "__main__":
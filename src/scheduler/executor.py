@@ -3,62 +3,141 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import codecs
 import logging
 import os
-import subprocess
-import sys
+import random
+import signal
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import Mapping
 
-from scheduler.models import Task, TaskRun, TaskStatus
+from scheduler.config import MAX_OUTPUT_CHARS, MAX_RETRYING_TASKS, RETRY_MAX_DELAY
+from scheduler.models import Task, TaskRun, TaskStatus, truncate_text
+from scheduler.webhooks import dispatcher
 
 logger = logging.getLogger(__name__)
 
 
 @dataclass
 class ExecutionResult:
+    __slots__ = ("success", "exit_code", "stdout", "stderr")
+    
     success: bool
     exit_code: int | None
     stdout: str
     stderr: str
 
 
-def execute_command(
+_POSIX = os.name == "posix"
+
+# UTF-8 needs at most 4 bytes per character, so this always covers
+# MAX_OUTPUT_CHARS of decoded output
+_OUTPUT_BYTES = MAX_OUTPUT_CHARS * 4
+_READ_CHUNK = 65536
+# The daemon never changes its own environment, so one snapshot serves as the
+# base for every task that sets variables
+_BASE_ENV: Mapping[str, str] = dict(os.environ)
+# UTF-8 continuation bytes, deleted to count characters without decoding
+_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+
+
+def _kill_process_tree(proc: asyncio.subprocess.Process) -> None:
+    """Kill a command started by execute_command along with its children."""
+    try:
+        if _POSIX:
+            # The shell leads its own session; killing the group also stops
+            # children that would otherwise keep the output pipes open
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except ProcessLookupError:
+        pass
+
+
+async def _read_capped(stream: asyncio.StreamReader) -> tuple[bytes, int]:
+    """Read a stream to EOF, keeping the first _OUTPUT_BYTES and counting the rest.
+    
+    Returns the kept bytes and the number of characters dropped after them.
+    """
+    buf = bytearray()
+    skipped = 0
+    
+    # Keep draining past the cap so the command never blocks on a full pipe
+    while chunk := await stream.read(_READ_CHUNK):
+        room = max(_OUTPUT_BYTES - len(buf), 0)
+        buf += chunk[:room]
+        if len(chunk) > room:
+            skipped += len(chunk[room:].translate(None, _CONTINUATION_BYTES))
+    
+    return bytes(buf), skipped
+
+
+def _decode_output(data: bytes, skipped: int) -> str:
+    """Decode captured output and truncate it for storage.
+    
+    Invalid UTF-8 is replaced rather than failing the whole run.
+    """
+    if len(data) < _OUTPUT_BYTES:
+        return truncate_text(data.decode("utf-8", errors="replace"))
+    
+    # The cap may split a multi-byte character; leave the partial tail out
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    text = decoder.decode(data, final=False)
+    if decoder.getstate()[0]:
+        skipped += 1
+    return truncate_text(text, skipped)
+
+
+async def execute_command(
     command: str,
     cwd: Path | None = None,
     env: dict[str, str] | None = None,
     timeout: int | None = None,
 ) -> ExecutionResult:
-    """Execute a shell command with optional working directory and environment."""
-    merged_env = os.environ.copy()
-    if env:
-        merged_env.update(env)
+    """Execute a shell command with optional working directory and environment.
+    
+    A timeout of None or 0 means the command may run indefinitely.
+    """
+    # Without overrides the child simply inherits the daemon's environment
+    merged_env = {**_BASE_ENV, **env} if env else None
     
     try:
-        result = subprocess.run(
+        proc = await asyncio.create_subprocess_shell(
             command,
-            shell=True,
             cwd=cwd,
             env=merged_env,
-            capture_output=True,
-            text=True,
-            timeout=timeout if timeout else None,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=_POSIX,
         )
         
+        try:
+            (stdout, stdout_skipped), (stderr, stderr_skipped), _ = await asyncio.wait_for(
+                asyncio.gather(
+                    _read_capped(proc.stdout),
+                    _read_capped(proc.stderr),
+                    proc.wait(),
+                ),
+                timeout or None,
+            )
+        except asyncio.TimeoutError:
+            _kill_process_tree(proc)
+            await proc.wait()
+            return ExecutionResult(
+                success=False,
+                exit_code=-1,
+                stdout="",
+                stderr=f"Command timed out after {timeout} seconds",
+            )
+        
         return ExecutionResult(
-            success=result.returncode == 0,
-            exit_code=result.returncode,
-            stdout=result.stdout,
-            stderr=result.stderr,
-        )
-    except subprocess.TimeoutExpired:
-        return ExecutionResult(
-            success=False,
-            exit_code=-1,
-            stdout="",
-            stderr=f"Command timed out after {timeout} seconds",
+            success=proc.returncode == 0,
+            exit_code=proc.returncode,
+            stdout=_decode_output(stdout, stdout_skipped),
+            stderr=_decode_output(stderr, stderr_skipped),
         )
     except Exception as e:
         return ExecutionResult(
@@ -69,17 +148,34 @@ def execute_command(
         )
 
 
+def retry_delay(base: int, attempt: int) -> float:
+    """Seconds to wait after a failed attempt: doubling from base, capped, jittered."""
+    delay = min(base * 2 ** (attempt - 1), max(base, RETRY_MAX_DELAY))
+    # Spread out tasks that failed together so they do not retry in lockstep
+    return delay + random.uniform(0, base * 0.1)
+
+
 class TaskExecutor:
     """Executes tasks with retry support."""
     
-    def __init__(self) -> None:
+    def __init__(self, max_retrying: int = MAX_RETRYING_TASKS) -> None:
         self._running: dict[str, TaskRun] = {}
+        # Bounds how many retries run at once; first attempts are not limited
+        self.max_retrying = max_retrying
+        # Created on first use: before Python 3.10 a Semaphore binds to the loop
+        # current at construction, which may not be the one running the tasks
+        self._retry_slots: asyncio.Semaphore | None = None
+    
+    def _retry_slot(self) -> asyncio.Semaphore:
+        """The semaphore limiting concurrent retries."""
+        if self._retry_slots is None:
+            self._retry_slots = asyncio.Semaphore(self.max_retrying)
+        return self._retry_slots
     
     async def execute(self, task: Task, run: TaskRun) -> ExecutionResult:
         """Execute a task with retry support."""
         env = task.get_environment_decoded()
         workdir = task.working_dir
-        timeout = task.timeout if task.timeout and task.timeout > 0 else None
         
         max_attempts = task.retry.max_attempts if task.retry else 1
         delay = task.retry.delay if task.retry else 0
@@ -89,12 +185,12 @@ class TaskExecutor:
         for attempt in range(1, max_attempts + 1):
             run.attempt = attempt
             
-            loop = asyncio.get_event_loop()
-            
-            def run_with_timeout() -> ExecutionResult:
-                return execute_command(task.command, workdir, env, timeout)
+            if attempt > 1 and delay > 0:
+                await asyncio.sleep(retry_delay(delay, attempt - 1))
             
-            last_result = await loop.run_in_executor(None, run_with_timeout)
+            slot = self._retry_slot() if attempt > 1 else nullcontext()
+            async with slot:
+                last_result = await execute_command(task.command, workdir, env, task.timeout)
             
             if last_result.success:
                 run.status = TaskStatus.SUCCESS
@@ -106,9 +202,6 @@ class TaskExecutor:
                 self._send_webhook(task, run)
                 
                 return last_result
-            
-            if attempt < max_attempts and delay > 0:
-                await asyncio.sleep(delay)
         
         run.status = TaskStatus.FAILED
         run.exit_code = last_result.exit_code
@@ -145,22 +238,9 @@ class TaskExecutor:
         run.webhook_called = True
         run.webhook_url = webhook.url
         
-        env = os.environ.copy()
-        env["WEBHOOK_URL"] = webhook.url
-        if webhook.token:
-            env["WEBHOOK_TOKEN"] = webhook.token
-        env["WEBHOOK_PAYLOAD"] = json.dumps(payload)
-        
-        try:
-            subprocess.Popen(
-                [sys.executable, "-m", "scheduler.webhook_runner"],
-                env=env,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                start_new_session=True,
-            )
+        if dispatcher.submit(webhook.url, webhook.token, payload):
             run.webhook_status = "triggered"
             logger.info(f"Webhook triggered for task {task.name}")
-        except Exception as e:
+        else:
             run.webhook_status = "failed"
-            logger.warning(f"Failed to trigger webhook for task {task.name}: {e}")
+            logger.warning(f"Failed to trigger webhook for task {task.name}: queue is full")
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
-from typing import Any
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Hashable
 
 from starlette.applications import Starlette
 from starlette.requests import Request
@@ -11,10 +14,94 @@ from starlette.responses import Response, JSONResponse, StreamingResponse
 from starlette.routing import Route
 
 from scheduler.core import Scheduler
-from scheduler.models import Task, TaskStatus, RetryPolicy, NotifyConfig, WebhookConfig
+from scheduler.jsonutil import dumps
+from scheduler.models import (
+    Task,
+    TaskRun,
+    TaskStatus,
+    RetryPolicy,
+    NotifyConfig,
+    WebhookConfig,
+    iter_history,
+)
 from scheduler.storage import TaskStorage
 
 
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson when it is installed."""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# Read-only methods whose results depend only on the stored tasks
+_CACHEABLE_METHODS = frozenset({"list_tasks", "get_task", "get_task_history"})
+_RESULT_CACHE_SIZE = 256
+
+
+def _earliest_next_run(result: Any) -> datetime | None:
+    """Earliest next_run among the task dicts in a result, if any."""
+    items = result if isinstance(result, list) else [result]
+    times = [
+        datetime.fromisoformat(item["next_run"])
+        for item in items
+        if isinstance(item, dict) and item.get("next_run")
+    ]
+    return min(times) if times else None
+
+
+class ResultCache:
+    """LRU cache of serialized results of read-only MCP methods.
+    
+    Keys include the storage revision, so saves and deletes invalidate entries.
+    Results listing next run times also expire once the earliest has passed.
+    """
+    
+    def __init__(self, maxsize: int = _RESULT_CACHE_SIZE) -> None:
+        """Create an empty cache holding at most maxsize responses."""
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[bytes, str, datetime | None]] = OrderedDict()
+    
+    def get(self, key: Hashable) -> tuple[bytes, str] | None:
+        """Get the (body, etag) cached for a key, if still valid."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        body, etag, expires = entry
+        if expires is not None and datetime.now() >= expires:
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return body, etag
+    
+    def put(self, key: Hashable, result: Any) -> tuple[bytes, str]:
+        """Serialize and cache a result, returning its (body, etag)."""
+        body = dumps(result)
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        
+        self._entries[key] = (body, etag, _earliest_next_run(result))
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        
+        return body, etag
+
+
+def _cache_key(method: str, params: dict[str, Any], storage: TaskStorage) -> Hashable | None:
+    """Cache key for a method call, or None if it must not be cached."""
+    if method not in _CACHEABLE_METHODS or not isinstance(params, dict):
+        return None
+    
+    key = (method, tuple(sorted(params.items())), storage.revision)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
 async def handle_sse(request: Request) -> StreamingResponse:
     """Handle SSE endpoint."""
     async def event_stream():
@@ -31,7 +118,7 @@ async def handle_sse(request: Request) -> StreamingResponse:
     )
 
 
-async def handle_messages(request: Request) -> JSONResponse:
+async def handle_messages(request: Request) -> Response:
     """Handle MCP message endpoint."""
     body = await request.json()
     method = body.get("method")
@@ -40,13 +127,28 @@ async def handle_messages(request: Request) -> JSONResponse:
     storage: TaskStorage = request.app.state.storage
     scheduler: Scheduler = request.app.state.scheduler
     
-    result = await handle_mcp_method(method, params, storage, scheduler)
+    key = _cache_key(method, params, storage)
+    if key is None:
+        result = await handle_mcp_method(method, params, storage, scheduler)
+        return ORJSONResponse({
+            "jsonrpc": "2.0",
+            "id": body.get("id"),
+            "result": result,
+        })
+    
+    cache: ResultCache = request.app.state.result_cache
+    cached = cache.get(key)
+    if cached is None:
+        result = await handle_mcp_method(method, params, storage, scheduler)
+        cached = cache.put(key, result)
+    result_body, etag = cached
     
-    return JSONResponse({
-        "jsonrpc": "2.0",
-        "id": body.get("id"),
-        "result": result,
-    })
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    # Splice the cached result into the envelope instead of re-encoding it
+    content = b'{"jsonrpc":"2.0","id":' + dumps(body.get("id")) + b',"result":' + result_body + b"}"
+    return Response(content, media_type="application/json", headers={"ETag": etag})
 
 
 async def handle_mcp_method(
@@ -82,11 +184,13 @@ async def handle_mcp_method(
         )
         
         storage.save(task)
+        scheduler.reload_task(task.name)
         return {"success": True, "message": f"Task '{task.name}' created"}
     
     elif method == "list_tasks":
         tasks = storage.list_all()
-        return [t.to_dict() for t in tasks]
+        now = datetime.now()
+        return [t.to_dict(now) for t in tasks]
     
     elif method == "get_task":
         name = params.get("name")
@@ -98,31 +202,13 @@ async def handle_mcp_method(
     elif method == "remove_task":
         name = params.get("name")
         if storage.delete(name):
+            scheduler.reload_task(name)
             return True
         return False
     
     elif method == "get_task_history":
-        task_name = params.get("task_name")
-        
-        if task_name:
-            task = storage.load(task_name)
-            if task is None:
-                return []
-            tasks = [task]
-        else:
-            tasks = storage.list_all()
-        
-        history = []
-        for task in tasks:
-            for run in task.runs:
-                history.append({
-                    "task": task.name,
-                    "executed_at": run.started_at.isoformat(),
-                    "exit_code": run.exit_code,
-                    "output": run.stdout + (f"\n{run.stderr}" if run.stderr else ""),
-                })
-        
-        return history
+        tasks = _history_tasks(storage, params.get("task_name"))
+        return [_history_entry(task, run) for task, run in iter_history(tasks)]
     
     elif method == "pause_scheduler":
         scheduler.pause()
@@ -146,7 +232,42 @@ async def handle_mcp_method(
         return {"error": f"Unknown method: {method}"}
 
 
-async def handle_tools(request: Request) -> JSONResponse:
+def _history_tasks(storage: TaskStorage, task_name: str | None) -> list[Task]:
+    """Load the tasks whose history was asked for: one task, or all of them."""
+    if task_name:
+        task = storage.load(task_name)
+        return [task] if task is not None else []
+    return storage.list_all()
+
+
+def _history_entry(task: Task, run: TaskRun) -> dict[str, Any]:
+    return {
+        "task": task.name,
+        "executed_at": run.started_at.isoformat(),
+        "exit_code": run.exit_code,
+        "output": run.stdout + (f"\n{run.stderr}" if run.stderr else ""),
+    }
+
+
+async def handle_history(request: Request) -> StreamingResponse:
+    """Stream execution history as newline-delimited JSON, oldest run first."""
+    storage: TaskStorage = request.app.state.storage
+    task_name = request.query_params.get("task_name")
+    
+    # TaskStorage is not thread-safe, so the tasks and their run lists are
+    # snapshotted here on the loop thread that also saves them
+    history = iter_history(_history_tasks(storage, task_name))
+    
+    # A plain generator, so Starlette drives the merge and encoding in a worker
+    # thread instead of on the event loop
+    def lines():
+        for task, run in history:
+            yield dumps(_history_entry(task, run)) + b"\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+async def handle_tools(request: Request) -> ORJSONResponse:
     """Return available tools."""
     tools = [
         {
@@ -218,7 +339,7 @@ async def handle_tools(request: Request) -> JSONResponse:
         },
     ]
     
-    return JSONResponse({"tools": tools})
+    return ORJSONResponse({"tools": tools})
 
 
 def create_mcp_app(storage: TaskStorage, scheduler: Scheduler) -> Starlette:
@@ -227,10 +348,12 @@ def create_mcp_app(storage: TaskStorage, scheduler: Scheduler) -> Starlette:
         Route("/sse", handle_sse),
         Route("/messages", handle_messages, methods=["POST"]),
         Route("/tools", handle_tools),
+        Route("/history", handle_history),
     ]
     
     app = Starlette(routes=routes)
     app.state.storage = storage
     app.state.scheduler = scheduler
+    app.state.result_cache = ResultCache()
     
     return app
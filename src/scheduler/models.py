@@ -3,15 +3,67 @@
 from __future__ import annotations
 
 import base64
+import heapq
+from collections import deque
 import re
-import uuid
+import secrets
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 import frontmatter
-from pydantic import BaseModel, Field, field_validator
+from croniter import croniter
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
+
+from scheduler import cronexpr
+from scheduler.config import DEFAULT_MAX_HISTORY, MAX_OUTPUT_CHARS, SPECIAL_CRONS
+from scheduler.cron_canon import canonicalize
+
+_INVALID_NAME_RE = re.compile(r'[<>:"/\\|?*]')
+_ENV_KEY_RE = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
+# Keeps command output from breaking out of its Markdown table cell
+_TABLE_CELL_ESCAPES = str.maketrans({"|": "\\|", "\n": " ", "\r": " "})
+_HISTORY_HEADING = "## Execution History"
+
+# (canonical schedule, tzinfo) -> (base_time, next_run) of the last croniter lookup; the cached
+# next_run is also the answer for any base time in [base_time, next_run)
+_next_run_cache: dict[tuple[str, Any], tuple[datetime, datetime]] = {}
+_NEXT_RUN_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=4096)
+def is_valid_cron(expr: str) -> bool:
+    """Check whether a cron expression is valid, memoized per expression."""
+    return croniter.is_valid(expr)
+
+
+def _next_run(schedule: str, base_time: datetime) -> datetime:
+    """Get the first fire time of a schedule after base_time."""
+    # Equivalent spellings of a schedule share one cache entry
+    canonical = canonicalize(schedule)
+    key = (canonical, base_time.tzinfo)
+    cached = _next_run_cache.get(key)
+    if cached is not None and cached[0] <= base_time < cached[1]:
+        return cached[1]
+    
+    fields = cronexpr.parse_cron(canonical)
+    next_run = cronexpr.next_fire(fields, base_time) if fields is not None else None
+    if next_run is None:
+        next_run = croniter(schedule, base_time).get_next(datetime)
+    
+    if len(_next_run_cache) >= _NEXT_RUN_CACHE_SIZE:
+        _next_run_cache.clear()
+    _next_run_cache[key] = (base_time, next_run)
+    
+    return next_run
+
+
+def _effective_cron(cron: str) -> str:
+    """Resolve special aliases such as @daily and canonicalize the result."""
+    return canonicalize(SPECIAL_CRONS.get(cron, cron))
 
 
 class TaskStatus(str, Enum):
@@ -85,8 +137,17 @@ class WebhookConfig(BaseModel):
         )
 
 
+def truncate_text(text: str, dropped: int = 0) -> str:
+    """Cut command output to MAX_OUTPUT_CHARS, noting how much was dropped."""
+    dropped += max(len(text) - MAX_OUTPUT_CHARS, 0)
+    if dropped:
+        return text[:MAX_OUTPUT_CHARS] + f"\n... ({dropped} chars truncated)"
+    return text
+
+
 class TaskRun(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4())[:8])
+    # Same 8 hex digits as a truncated uuid4, without building a UUID per run
+    id: str = Field(default_factory=lambda: secrets.token_hex(4))
     started_at: datetime
     finished_at: datetime | None = None
     status: TaskStatus = TaskStatus.PENDING
@@ -102,10 +163,7 @@ class TaskRun(BaseModel):
     @field_validator("stdout", "stderr")
     @classmethod
     def truncate_output(cls, v: str) -> str:
-        max_len = 10000
-        if len(v) > max_len:
-            return v[:max_len] + f"\n... ({len(v) - max_len} chars truncated)"
-        return v
+        return truncate_text(v)
 
 
 class Task(BaseModel):
@@ -127,41 +185,64 @@ class Task(BaseModel):
     owner: str = ""
     
     last_run: datetime | None = None
+    next_run_at: datetime | None = None
     last_status: TaskStatus | None = None
     run_count: int = 0
     fail_count: int = 0
-    runs: list[TaskRun] = Field(default_factory=list, exclude=True)
-    max_history: int = 50
+    # Oldest first; the Markdown history table lists them newest first
+    runs: deque[TaskRun] = Field(default_factory=deque, exclude=True)
+    max_history: int = DEFAULT_MAX_HISTORY
+    
+    # (cron, effective cron) so an edited cron is detected and re-resolved
+    _effective: tuple[str, str] = PrivateAttr(default=("", ""))
+    # Rendered history table rows, newest first; built on first save and then
+    # extended by add_run
+    _history_rows: deque[str] | None = PrivateAttr(default=None)
+    # (updated_at, next_run, to_dict() result); stale once either changes
+    _dict_cache: tuple[datetime, datetime | None, dict[str, Any]] | None = PrivateAttr(None)
+    # (updated_at, environment, decoded environment); stale once either changes
+    _env_cache: tuple[datetime, dict[str, str], dict[str, str]] | None = PrivateAttr(None)
+    # Effective cron next_run_at was computed for; a hand-edited cron no longer matches
+    _next_run_schedule: str | None = PrivateAttr(None)
+    
+    def model_post_init(self, __context: Any) -> None:
+        self._effective = (self.cron, _effective_cron(self.cron))
+        # Bounded so add_run evicts the oldest run in O(1)
+        self.runs = deque(self.runs, maxlen=self.max_history)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        # Assigning any field directly (task.command = ...) makes the cached
+        # to_dict() and decoded environment stale
+        if not name.startswith("_"):
+            self._dict_cache = None
+            self._env_cache = None
+    
+    @property
+    def effective_cron(self) -> str:
+        """The schedule with special aliases resolved, in canonical form."""
+        cron, effective = self._effective
+        if cron != self.cron:
+            effective = _effective_cron(self.cron)
+            self._effective = (self.cron, effective)
+        return effective
     
     @field_validator("name")
     @classmethod
     def validate_name(cls, v: str) -> str:
         if not v or not v.strip():
             raise ValueError("Task name cannot be empty")
-        if re.search(r'[<>:"/\\|?*]', v):
+        if _INVALID_NAME_RE.search(v):
             raise ValueError("Task name contains invalid characters")
         return v.strip()
     
     @field_validator("cron")
     @classmethod
     def validate_cron(cls, v: str) -> str:
-        from croniter import croniter
-        
-        special = {
-            "@yearly": "0 0 1 1 *",
-            "@annually": "0 0 1 1 *",
-            "@monthly": "0 0 1 * *",
-            "@weekly": "0 0 * * 0",
-            "@daily": "0 0 * * *",
-            "@midnight": "0 0 * * *",
-            "@hourly": "0 * * * *",
-            "@reboot": "@reboot",
-        }
-        
-        schedule = special.get(v, v)
+        schedule = SPECIAL_CRONS.get(v, v)
         
         if schedule != "@reboot":
-            if not croniter.is_valid(schedule):
+            if not is_valid_cron(schedule):
                 raise ValueError(f"Invalid cron expression: {v}")
         
         return v
@@ -178,12 +259,16 @@ class Task(BaseModel):
     def validate_environment(cls, v: dict[str, str]) -> dict[str, str]:
         normalized = {}
         for key, value in v.items():
-            if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', key):
+            if not _ENV_KEY_RE.match(key):
                 raise ValueError(f"Invalid environment variable name: {key}")
             normalized[key] = value
         return normalized
     
     def get_environment_decoded(self) -> dict[str, str]:
+        cached = self._env_cache
+        if cached is not None and cached[0] == self.updated_at and cached[1] is self.environment:
+            return dict(cached[2])
+        
         decoded = {}
         for key, value in self.environment.items():
             if value.startswith("base64:"):
@@ -194,7 +279,9 @@ class Task(BaseModel):
                     decoded[key] = value
             else:
                 decoded[key] = value
-        return decoded
+        
+        self._env_cache = (self.updated_at, self.environment, decoded)
+        return dict(decoded)
     
     def add_environment_encoded(self, key: str, value: str, encode: bool = False) -> None:
         if encode:
@@ -203,12 +290,16 @@ class Task(BaseModel):
         else:
             self.environment[key] = value
         self.updated_at = datetime.now()
+        self._dict_cache = None
+        self._env_cache = None
     
     def add_run(self, run: TaskRun) -> None:
+        if self.runs.maxlen != self.max_history:
+            self.runs = deque(self.runs, maxlen=self.max_history)
         self.runs.append(run)
         
-        if len(self.runs) > self.max_history:
-            self.runs = self.runs[-self.max_history:]
+        if self._history_rows is not None and self._history_rows.maxlen == self.max_history:
+            self._history_rows.appendleft(_render_history_row(run))
         
         self.last_run = run.finished_at or run.started_at
         self.last_status = run.status
@@ -218,33 +309,55 @@ class Task(BaseModel):
             self.fail_count += 1
         
         self.updated_at = datetime.now()
-    
-    def get_next_run(self, base_time: datetime | None = None) -> datetime | None:
-        from croniter import croniter
+        self._dict_cache = None
         
+        # The next fire time after this run, persisted by the next save
+        self.next_run_at = None
+        self.get_next_run(now=self.last_run)
+    
+    def get_next_run(
+        self,
+        base_time: datetime | None = None,
+        now: datetime | None = None,
+    ) -> datetime | None:
+        """Get the next fire time after base_time, or the upcoming one as of now.
+        
+        Callers handling many tasks pass one ``now`` so they share a clock reading.
+        """
         if not self.enabled:
             return None
         
         if self.cron == "@reboot":
             return None
         
-        special = {
-            "@yearly": "0 0 1 1 *",
-            "@annually": "0 0 1 1 *",
-            "@monthly": "0 0 1 * *",
-            "@weekly": "0 0 * * 0",
-            "@daily": "0 0 * * *",
-            "@midnight": "0 0 * * *",
-            "@hourly": "0 * * * *",
-        }
+        schedule = self.effective_cron
+        
+        if base_time is not None:
+            try:
+                return _next_run(schedule, base_time)
+            except Exception:
+                return None
         
-        schedule = special.get(self.cron, self.cron)
+        if now is None:
+            now = datetime.now()
+        if self._is_next_run_current(schedule, now):
+            return self.next_run_at
         
         try:
-            itr = croniter(schedule, base_time or datetime.now())
-            return itr.get_next(datetime)
+            self.next_run_at = _next_run(schedule, now)
         except Exception:
             return None
+        
+        self._next_run_schedule = schedule
+        return self.next_run_at
+    
+    def _is_next_run_current(self, schedule: str, now: datetime) -> bool:
+        """Check whether the stored next_run_at is still the upcoming fire time."""
+        if self.next_run_at is None or self.next_run_at <= now:
+            return False
+        
+        # Guard against a cron edited by hand after next_run_at was stored
+        return schedule == self._next_run_schedule
     
     def to_frontmatter(self) -> frontmatter.Post:
         metadata = {
@@ -292,6 +405,11 @@ class Task(BaseModel):
         if self.last_run:
             metadata["last_run"] = self.last_run.isoformat()
         
+        # Only the stored value is written; serializing never computes a new one
+        if self.next_run_at is not None and self._next_run_schedule is not None:
+            metadata["next_run"] = self.next_run_at.isoformat()
+            metadata["next_run_cron"] = self._next_run_schedule
+        
         if self.last_status:
             metadata["last_status"] = self.last_status.value
         
@@ -310,23 +428,13 @@ class Task(BaseModel):
             lines.append(self.description)
             lines.append("")
         
-        lines.append("## Execution History")
+        lines.append(_HISTORY_HEADING)
         lines.append("")
         
         if self.runs:
             lines.append("| 执行时间 | 退出码 | Webhook | 输出 |")
             lines.append("|----------|--------|---------|------|")
-            
-            for run in reversed(self.runs[-self.max_history:]):
-                executed_at = run.started_at.strftime("%Y-%m-%d %H:%M:%S")
-                exit_code = str(run.exit_code) if run.exit_code is not None else "-"
-                webhook = run.webhook_status if run.webhook_called else "-"
-                
-                output = (run.stdout or "")[:80].replace("|", "\\|").replace("\n", " ")
-                if len(run.stdout or "") > 80:
-                    output += "..."
-                
-                lines.append(f"| {executed_at} | {exit_code} | {webhook} | {output} |")
+            lines.extend(self._get_history_rows())
         else:
             lines.append("*No execution history yet*")
         
@@ -334,6 +442,19 @@ class Task(BaseModel):
         
         return "\n".join(lines)
     
+    def _get_history_rows(self) -> deque[str]:
+        rows = self._history_rows
+        expected = min(len(self.runs), self.max_history)
+        
+        # Rebuild if runs were changed other than through add_run
+        if rows is None or rows.maxlen != self.max_history or len(rows) != expected:
+            rows = deque(
+                (_render_history_row(run) for run in islice(reversed(self.runs), self.max_history)),
+                maxlen=self.max_history,
+            )
+            self._history_rows = rows
+        return rows
+    
     @classmethod
     def from_frontmatter(cls, post: frontmatter.Post) -> Task:
         metadata = post.metadata
@@ -376,75 +497,96 @@ class Task(BaseModel):
         if "last_run" in metadata:
             data["last_run"] = datetime.fromisoformat(metadata["last_run"])
         
+        if "next_run" in metadata:
+            data["next_run_at"] = datetime.fromisoformat(metadata["next_run"])
+        
         if "last_status" in metadata:
             data["last_status"] = TaskStatus(metadata["last_status"])
         
         data["run_count"] = metadata.get("run_count", 0)
         data["fail_count"] = metadata.get("fail_count", 0)
         
-        runs = cls._parse_execution_history(post.content)
+        runs = cls._parse_execution_history(post.content, limit=DEFAULT_MAX_HISTORY)
         data["runs"] = runs
         
-        return cls(**data)
+        task = cls(**data)
+        task._next_run_schedule = metadata.get("next_run_cron")
+        return task
     
     @classmethod
-    def _parse_execution_history(cls, content: str) -> list[TaskRun]:
-        import re
+    def _parse_execution_history(cls, content: str, limit: int | None = None) -> list[TaskRun]:
+        """Parse the history table (newest first) into runs, oldest first.
         
-        runs = []
+        With a limit, only the newest ``limit`` runs are parsed.
+        """
+        runs: list[TaskRun] = []
         
-        section_match = re.search(
-            r'## Execution History.*?\n(.*?)(?=\n## |\Z)',
-            content,
-            re.DOTALL
-        )
-        
-        if not section_match:
+        start = content.find(_HISTORY_HEADING)
+        if start < 0:
             return runs
+        start = content.find("\n", start)
+        if start < 0:
+            return runs
+        end = content.find("\n## ", start)
         
-        table_content = section_match.group(1)
-        
-        for line in table_content.split('\n'):
-            if not line.strip().startswith('|') or '---' in line:
+        columns = 0
+        for line in content[start + 1:end if end >= 0 else None].splitlines():
+            line = line.strip()
+            if not line.startswith("|"):
                 continue
             
-            parts = [p.strip() for p in line.split('|')[1:-1]]
-            if len(parts) < 2:
+            if not columns:
+                # The header row tells the current four-column table from
+                # the older one without the Webhook column
+                columns = line.count("|") - 1
+                continue
+            
+            # Only the output cell can contain (escaped) pipes, and it is last
+            parts = line.split("|", columns)
+            if len(parts) <= columns or parts[1].lstrip().startswith("-"):
                 continue
             
             try:
-                started_at = datetime.strptime(parts[0], "%Y-%m-%d %H:%M:%S")
-                exit_code = int(parts[1]) if parts[1] != '-' else None
-                
-                webhook_called = False
-                webhook_status = None
-                stdout = ""
-                
-                if len(parts) >= 4:
-                    webhook_called = parts[2] != '-'
-                    webhook_status = parts[2] if webhook_called else None
-                    stdout = parts[3] if len(parts) > 3 else ""
-                elif len(parts) == 3:
-                    stdout = parts[2]
-                
-                run = TaskRun(
-                    started_at=started_at,
-                    exit_code=exit_code,
-                    stdout=stdout.replace("\\|", "|"),
-                    status=TaskStatus.SUCCESS if exit_code == 0 else TaskStatus.FAILED,
-                    webhook_called=webhook_called,
-                    webhook_status=webhook_status,
-                )
-                runs.append(run)
-            except (ValueError, IndexError):
+                started_at = datetime.fromisoformat(parts[1].strip())
+                code = parts[2].strip()
+                exit_code = int(code) if code != "-" else None
+            except ValueError:
                 continue
+            
+            webhook_called = False
+            webhook_status = None
+            if columns >= 4:
+                webhook = parts[3].strip()
+                webhook_called = webhook != "-"
+                webhook_status = webhook if webhook_called else None
+            
+            stdout = parts[-1].strip()
+            if stdout.endswith("|") and not stdout.endswith("\\|"):
+                stdout = stdout[:-1].rstrip()
+            
+            runs.append(TaskRun(
+                started_at=started_at,
+                exit_code=exit_code,
+                stdout=stdout.replace("\\|", "|"),
+                status=TaskStatus.SUCCESS if exit_code == 0 else TaskStatus.FAILED,
+                webhook_called=webhook_called,
+                webhook_status=webhook_status,
+            ))
+            
+            if limit is not None and len(runs) >= limit:
+                break
         
+        runs.reverse()
         return runs
     
-    def to_dict(self) -> dict[str, Any]:
-        next_run = self.get_next_run()
+    def to_dict(self, now: datetime | None = None) -> dict[str, Any]:
+        next_run = self.get_next_run(now=now)
         
-        return {
+        cached = self._dict_cache
+        if cached is not None and cached[0] == self.updated_at and cached[1] == next_run:
+            return dict(cached[2])
+        
+        data = {
             "name": self.name,
             "cron": self.cron,
             "command": self.command,
@@ -467,3 +609,26 @@ class Task(BaseModel):
             "fail_count": self.fail_count,
             "next_run": next_run.isoformat() if next_run else None,
         }
+        
+        self._dict_cache = (self.updated_at, next_run, data)
+        return dict(data)
+
+
+def _render_history_row(run: TaskRun) -> str:
+    """Render a run as a row of the Markdown history table."""
+    # Run times are naive local timestamps, so this matches "%Y-%m-%d %H:%M:%S"
+    executed_at = run.started_at.isoformat(sep=" ", timespec="seconds")
+    exit_code = str(run.exit_code) if run.exit_code is not None else "-"
+    webhook = run.webhook_status if run.webhook_called else "-"
+    
+    output = (run.stdout or "")[:80].translate(_TABLE_CELL_ESCAPES)
+    if len(run.stdout or "") > 80:
+        output += "..."
+    
+    return f"| {executed_at} | {exit_code} | {webhook} | {output} |"
+
+
+def iter_history(tasks: Iterable[Task]) -> Iterator[tuple[Task, TaskRun]]:
+    """Iterate over the runs of several tasks as one stream, oldest first."""
+    streams = [[(task, run) for run in task.runs] for task in tasks]
+    return heapq.merge(*streams, key=lambda item: item[1].started_at)
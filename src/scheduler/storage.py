@@ -2,13 +2,93 @@
 
 from __future__ import annotations
 
+import heapq
+import os
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import attrgetter
+
 import frontmatter
+import yaml
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 from scheduler.config import TASKS_DIR, DATA_DIR
 from scheduler.models import Task, TaskRun, TaskStatus
 
+# Below this many files a thread pool costs more than it saves
+_PARALLEL_READ_THRESHOLD = 16
+
+_UNSAFE_NAME_CHARS_RE = re.compile(r"[^\w -]+")
+
+# Sort key for listing order; attrgetter avoids a Python-level call per task
+_created_at = attrgetter("created_at")
+
+# libyaml-backed when PyYAML was built with it, like python-frontmatter's own choice
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def _read_file(path: Path | str) -> str | None:
+    """Read a task file, returning None if it cannot be read."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _load_post(text: str) -> frontmatter.Post:
+    """Split a task file into front matter and content, like frontmatter.loads."""
+    # Files written by save() always have this shape; anything else (CRLF line
+    # endings, other delimiters) is left to python-frontmatter
+    if text.startswith("---\n"):
+        end = text.find("\n---\n", 3)
+        if end >= 0:
+            metadata = yaml.load(text[4:end], Loader=_YamlLoader)
+            if isinstance(metadata, dict):
+                post = frontmatter.Post(text[end + 5:].strip())
+                post.metadata.update(metadata)
+                return post
+    
+    return frontmatter.loads(text)
+
+
+def _dump_post(post: frontmatter.Post) -> str:
+    """Serialize a post exactly as frontmatter.dumps does with its YAML handler."""
+    metadata = yaml.dump(
+        post.metadata,
+        Dumper=_YamlDumper,
+        default_flow_style=False,
+        allow_unicode=True,
+    ).strip()
+    return f"---\n{metadata}\n---\n\n{post.content}".strip()
+
+
+@lru_cache(maxsize=4096)
+def _task_file_name(name: str) -> str:
+    """File name for a task: letters, digits, '-' and '_' kept, spaces as '_'."""
+    # \w matches exactly the characters str.isalnum() accepts, plus '_'
+    safe_name = _UNSAFE_NAME_CHARS_RE.sub("", name).rstrip()
+    return f"{safe_name.replace(' ', '_')}.md"
+
+
+@lru_cache(maxsize=256)
+def _resolve_data_dir(data_dir: str) -> Path:
+    """Resolve symlinks in an absolute data directory path."""
+    return Path(data_dir).resolve()
+
+
+def _discard(index: dict[str, set[str]], value: str, key: str) -> None:
+    """Remove a key from a secondary index entry, dropping the entry once empty."""
+    keys = index.get(value)
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            del index[value]
+
 
 class TaskStorage:
     """Manages task storage in Markdown files with YAML Front Matter."""
@@ -17,35 +97,264 @@ class TaskStorage:
         if data_dir is None:
             data_dir = DATA_DIR
         
-        self.data_dir = Path(data_dir).expanduser().resolve()
+        # Relative paths depend on the working directory, so only absolute ones
+        # are memoized
+        data_path = Path(data_dir).expanduser()
+        if data_path.is_absolute():
+            self.data_dir = _resolve_data_dir(str(data_path))
+        else:
+            self.data_dir = data_path.resolve()
         self.tasks_dir = self.data_dir / "tasks"
         
         self.tasks_dir.mkdir(parents=True, exist_ok=True)
+        
+        # In-memory index of parsed tasks keyed by file name, built on first use
+        # and kept current by save/delete/load; refresh() picks up other writers
+        self._index: dict[str, Task] | None = None
+        # Secondary indices over the index: file names of enabled tasks and of
+        # tasks per tag and per owner, running totals for get_stats, and the
+        # (tags, owner, run_count, fail_count) each task was filed under
+        self._enabled: set[str] = set()
+        self._tag_index: dict[str, set[str]] = {}
+        self._owner_index: dict[str, set[str]] = {}
+        self._total_runs = 0
+        self._total_failures = 0
+        self._filed: dict[str, tuple[frozenset[str], str, int, int]] = {}
+        self._revision = 0
+        # Parsed tasks (None if unparseable) keyed by file name with the
+        # (mtime_ns, size) they were parsed at, so only changed files are re-parsed
+        self._file_cache: dict[str, tuple[tuple[int, int], Task | None]] = {}
+        # (revision, all tasks sorted by creation time) from the last full listing
+        self._sorted: tuple[int, list[Task]] | None = None
+    
+    @property
+    def revision(self) -> int:
+        """Counter bumped whenever this instance writes or notices a task change."""
+        return self._revision
+    
+    def _get_index(self) -> dict[str, Task]:
+        """Get the task index, building it on first use."""
+        if self._index is None:
+            self.refresh()
+        return self._index
+    
+    def refresh(self) -> None:
+        """Bring the index up to date with the task files on disk.
+        
+        Stats every task file and re-parses the ones whose (mtime_ns, size)
+        changed, so writes by other processes and hand edits are picked up.
+        """
+        if self._index is None:
+            self._index = {}
+        index = self._index
+        
+        seen: set[str] = set()
+        changed: list[tuple[os.DirEntry[str], tuple[int, int]]] = []
+        refiled: list[tuple[str, Task | None]] = []
+        
+        # DirEntry carries the name and path without building Path objects
+        with os.scandir(self.tasks_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".md"):
+                    continue
+                
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                
+                seen.add(entry.name)
+                signature = (stat.st_mtime_ns, stat.st_size)
+                cached = self._file_cache.get(entry.name)
+                if cached is None or cached[0] != signature:
+                    changed.append((entry, signature))
+                elif cached[1] is not index.get(entry.name):
+                    # Parsed by _load_cached but not yet in the index
+                    refiled.append((entry.name, cached[1]))
+        
+        removed = (index.keys() | self._file_cache.keys()) - seen
+        if not changed and not refiled and not removed:
+            return
+        
+        # File reads release the GIL, so fetch contents concurrently and parse after
+        paths = [entry.path for entry, _ in changed]
+        if len(paths) >= _PARALLEL_READ_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=min(32, len(paths))) as pool:
+                contents = list(pool.map(_read_file, paths))
+        else:
+            contents = [_read_file(path) for path in paths]
+        
+        for (entry, signature), content in zip(changed, contents):
+            task = self._parse_task(content)
+            # Unparseable files are cached too, so they are not re-read every call
+            self._file_cache[entry.name] = (signature, task)
+            refiled.append((entry.name, task))
+        
+        for key in removed:
+            self._file_cache.pop(key, None)
+            refiled.append((key, None))
+        
+        for key, task in refiled:
+            self._reindex(key, task)
+        
+        self._revision += 1
+    
+    def _reindex(self, key: str, task: Task | None) -> None:
+        """Put a task into the index under its file name, or drop it if None."""
+        if task is None:
+            if self._index.pop(key, None) is not None:
+                self._unfile_task(key)
+        else:
+            self._index[key] = task
+            self._file_task(key, task)
+    
+    def _file_task(self, key: str, task: Task) -> None:
+        """Add a task to the secondary indices, replacing its previous entries."""
+        self._unfile_task(key)
+        
+        if task.enabled:
+            self._enabled.add(key)
+        tags = frozenset(task.tags)
+        for tag in tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+        self._owner_index.setdefault(task.owner, set()).add(key)
+        self._total_runs += task.run_count
+        self._total_failures += task.fail_count
+        self._filed[key] = (tags, task.owner, task.run_count, task.fail_count)
+    
+    def _unfile_task(self, key: str) -> None:
+        """Remove a task from the secondary indices."""
+        self._enabled.discard(key)
+        
+        # Use what the task was filed under; the Task object may since have
+        # been modified in place
+        filed = self._filed.pop(key, None)
+        if filed is None:
+            return
+        
+        tags, owner, run_count, fail_count = filed
+        for tag in tags:
+            _discard(self._tag_index, tag, key)
+        _discard(self._owner_index, owner, key)
+        self._total_runs -= run_count
+        self._total_failures -= fail_count
+    
+    def _indexed_tasks(self, index: dict[str, Task], keys: Iterable[str]) -> list[Task]:
+        """Get indexed tasks by file name, ordered by creation time."""
+        tasks = [index[key] for key in keys]
+        tasks.sort(key=_created_at)
+        return tasks
+    
+    def _read_task(self, task_path: Path) -> Task | None:
+        """Parse a task file, returning None if it cannot be read."""
+        return self._parse_task(_read_file(task_path))
+    
+    def _load_cached(self, task_path: Path) -> Task | None:
+        """Load a task file, reusing the parsed task while the file is unchanged."""
+        try:
+            stat = task_path.stat()
+        except OSError:
+            self._file_cache.pop(task_path.name, None)
+            return None
+        
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._file_cache.get(task_path.name)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        
+        task = self._read_task(task_path)
+        self._file_cache[task_path.name] = (signature, task)
+        return task
+    
+    def _parse_task(self, content: str | None) -> Task | None:
+        """Parse task file contents, returning None if they are not a valid task."""
+        if content is None:
+            return None
+        
+        try:
+            post = _load_post(content)
+            return Task.from_frontmatter(post)
+        except Exception:
+            return None
     
     def _get_task_path(self, name: str) -> Path:
         """Get file path for a task by name."""
-        safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        safe_name = safe_name.replace(' ', '_')
-        return self.tasks_dir / f"{safe_name}.md"
+        return self.tasks_dir / _task_file_name(name)
+    
+    def _write_task(self, task: Task, sync: bool = False) -> tuple[str, tuple[int, int]]:
+        """Write a task file atomically, returning its file name and (mtime_ns, size).
+        
+        With sync, the file contents are flushed to disk before the rename.
+        """
+        task_path = self._get_task_path(task.name)
+        data = _dump_post(task.to_frontmatter()).encode("utf-8")
+        
+        # Written to a sibling and renamed over the task file, so readers never
+        # see a partial file; the name does not end in .md, so scans skip it
+        tmp_path = task_path.with_name(f".{task_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                # Flushed first, so fstat sees the final size and mtime
+                f.flush()
+                if sync:
+                    os.fsync(f.fileno())
+                stat = os.fstat(f.fileno())
+            os.replace(tmp_path, task_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        
+        return task_path.name, (stat.st_mtime_ns, stat.st_size)
+    
+    def _cache_written(self, key: str, signature: tuple[int, int], task: Task) -> None:
+        """Record a task just written by this instance in the caches and indices."""
+        # A copy, so later changes to the caller's object do not leak into the cache
+        task = task.model_copy(deep=True)
+        self._file_cache[key] = (signature, task)
+        
+        if self._index is not None:
+            self._reindex(key, task)
     
     def save(self, task: Task) -> None:
         """Save a task to storage."""
-        task_path = self._get_task_path(task.name)
-        post = task.to_frontmatter()
-        task_path.write_text(frontmatter.dumps(post), encoding="utf-8")
+        key, signature = self._write_task(task)
+        self._revision += 1
+        self._cache_written(key, signature, task)
+    
+    def save_many(self, tasks: Iterable[Task]) -> None:
+        """Save several tasks durably, with one directory fsync for all of them."""
+        written = [(self._write_task(task, sync=True), task) for task in tasks]
+        if not written:
+            return
+        
+        # Makes the renames durable; opening a directory is POSIX-only
+        if os.name == "posix":
+            fd = os.open(self.tasks_dir, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        
+        # Caches are only updated once every file is in place
+        self._revision += 1
+        for (key, signature), task in written:
+            self._cache_written(key, signature, task)
     
     def load(self, name: str) -> Task | None:
-        """Load a task from storage by name."""
+        """Load a task from storage by name.
+        
+        Only this task's file is checked for changes. The result is a copy, so
+        modifying it has no effect until it is saved.
+        """
         task_path = self._get_task_path(name)
+        task = self._load_cached(task_path)
         
-        if not task_path.exists():
-            return None
+        if self._index is not None and self._index.get(task_path.name) is not task:
+            self._reindex(task_path.name, task)
+            self._revision += 1
         
-        try:
-            post = frontmatter.load(task_path)
-            return Task.from_frontmatter(post)
-        except Exception:
-            return None
+        return task.model_copy(deep=True) if task is not None else None
     
     def delete(self, name: str) -> bool:
         """Delete a task from storage."""
@@ -55,26 +364,36 @@ class TaskStorage:
             return False
         
         task_path.unlink()
+        self._revision += 1
+        self._file_cache.pop(task_path.name, None)
+        
+        if self._index is not None:
+            self._reindex(task_path.name, None)
+        
         return True
     
-    def list_all(self) -> list[Task]:
-        """List all tasks in storage."""
-        tasks = []
+    def list_all(self, limit: int | None = None) -> list[Task]:
+        """List tasks in storage, oldest first; with a limit, only the oldest ``limit``.
         
-        for task_file in self.tasks_dir.glob("*.md"):
-            try:
-                post = frontmatter.load(task_file)
-                task = Task.from_frontmatter(post)
-                tasks.append(task)
-            except Exception:
-                continue
+        Like the other listings, the tasks are shared with the index and must not
+        be modified; load() a task to change it.
+        """
+        tasks = self._get_index().values()
         
-        tasks.sort(key=lambda t: t.created_at)
-        return tasks
+        # Every change to the stored tasks bumps the revision, so the order
+        # sorted at the same revision is still valid
+        if self._sorted is None or self._sorted[0] != self._revision:
+            if limit is not None and limit < len(tasks):
+                # Partial sort: O(N log limit) instead of sorting everything
+                return heapq.nsmallest(limit, tasks, key=_created_at)
+            self._sorted = (self._revision, sorted(tasks, key=_created_at))
+        
+        return self._sorted[1][:limit]
     
     def list_enabled(self) -> list[Task]:
         """List all enabled tasks."""
-        return [t for t in self.list_all() if t.enabled]
+        index = self._get_index()
+        return self._indexed_tasks(index, self._enabled)
     
     def find_by_name(self, name: str) -> Task | None:
         """Find a task by exact name."""
@@ -82,26 +401,244 @@ class TaskStorage:
     
     def find_by_tag(self, tag: str) -> list[Task]:
         """Find tasks by tag."""
-        return [t for t in self.list_all() if tag in t.tags]
+        index = self._get_index()
+        return self._indexed_tasks(index, self._tag_index.get(tag, ()))
     
     def find_by_owner(self, owner: str) -> list[Task]:
         """Find tasks by owner."""
-        return [t for t in self.list_all() if t.owner == owner]
+        index = self._get_index()
+        return self._indexed_tasks(index, self._owner_index.get(owner, ()))
     
     def exists(self, name: str) -> bool:
         """Check if a task exists."""
         return self._get_task_path(name).exists()
     
+    def names(self) -> list[str]:
+        """Names of all stored tasks, in no particular order."""
+        return [task.name for task in self._get_index().values()]
+    
     def get_stats(self) -> dict[str, Any]:
         """Get storage statistics."""
-        tasks = self.list_all()
-        enabled = sum(1 for t in tasks if t.enabled)
+        # Counts are kept up to date as tasks are filed, so this is O(1)
+        total = len(self._get_index())
+        enabled = len(self._enabled)
         
         return {
-            "total_tasks": len(tasks),
+            "total_tasks": total,
             "enabled_tasks": enabled,
-            "disabled_tasks": len(tasks) - enabled,
-            "total_runs": sum(t.run_count for t in tasks),
-            "total_failures": sum(t.fail_count for t in tasks),
+            "disabled_tasks": total - enabled,
+            "total_runs": self._total_runs,
+            "total_failures": self._total_failures,
             "data_dir": str(self.data_dir),
         }
+
+
+# Bumped whenever the schema changes; the index is derived from the task files,
+# so an outdated one is dropped and rebuilt rather than migrated
+_INDEX_VERSION = 3
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    file TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    enabled INTEGER NOT NULL,
+    cron TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    owner TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    last_run TEXT,
+    run_count INTEGER NOT NULL,
+    fail_count INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_enabled ON tasks(enabled) WHERE enabled = 1;
+CREATE INDEX IF NOT EXISTS idx_tasks_owner ON tasks(owner);
+CREATE TABLE IF NOT EXISTS task_tags (
+    file TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (file, tag)
+);
+CREATE INDEX IF NOT EXISTS idx_task_tags_tag ON task_tags(tag);
+"""
+
+
+class SqliteIndexedStorage(TaskStorage):
+    """Task storage with a SQLite index over task metadata.
+    
+    The Markdown files remain the source of truth; the index in
+    ``data_dir/index.sqlite3`` only answers filter and stats queries so they do
+    not have to parse every task file. Rows are reconciled against each file's
+    (mtime_ns, size) before each query, so files written by a plain TaskStorage
+    are picked up too.
+    """
+    
+    def __init__(self, data_dir: Path | str | None = None) -> None:
+        """Open, creating if needed, the SQLite index next to the task files."""
+        super().__init__(data_dir)
+        
+        self.index_path = self.data_dir / "index.sqlite3"
+        self._conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        if version != _INDEX_VERSION:
+            self._conn.executescript("DROP TABLE IF EXISTS tasks; DROP TABLE IF EXISTS task_tags;")
+        self._conn.executescript(_INDEX_SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {_INDEX_VERSION}")
+    
+    def close(self) -> None:
+        """Close the index database."""
+        self._conn.close()
+    
+    def _index_task(self, file: str, task: Task, signature: tuple[int, int]) -> None:
+        """Insert or replace the index rows of a task (caller commits)."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO tasks (file, name, enabled, cron, priority, owner,"
+            " created_at, last_run, run_count, fail_count, mtime_ns, size)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                file,
+                task.name,
+                int(task.enabled),
+                task.cron,
+                task.priority,
+                task.owner,
+                task.created_at.isoformat(),
+                task.last_run.isoformat() if task.last_run else None,
+                task.run_count,
+                task.fail_count,
+                *signature,
+            ),
+        )
+        self._conn.execute("DELETE FROM task_tags WHERE file = ?", (file,))
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO task_tags (file, tag) VALUES (?, ?)",
+            [(file, tag) for tag in task.tags],
+        )
+    
+    def _unindex_task(self, file: str) -> None:
+        """Remove the index rows of a task (caller commits)."""
+        self._conn.execute("DELETE FROM tasks WHERE file = ?", (file,))
+        self._conn.execute("DELETE FROM task_tags WHERE file = ?", (file,))
+    
+    def _sync_index(self) -> None:
+        """Re-index task files whose (mtime_ns, size) differs from the indexed one."""
+        known = {
+            file: (mtime_ns, size)
+            for file, mtime_ns, size in self._conn.execute(
+                "SELECT file, mtime_ns, size FROM tasks"
+            )
+        }
+        seen = set()
+        
+        with self._conn:
+            with os.scandir(self.tasks_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".md"):
+                        continue
+                    
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    
+                    seen.add(entry.name)
+                    signature = (stat.st_mtime_ns, stat.st_size)
+                    if known.get(entry.name) == signature:
+                        continue
+                    
+                    task = self._read_task(Path(entry.path))
+                    if task is None:
+                        self._unindex_task(entry.name)
+                    else:
+                        self._index_task(entry.name, task, signature)
+            
+            for file in known.keys() - seen:
+                self._unindex_task(file)
+    
+    def _load_files(self, files: list[str]) -> list[Task]:
+        """Load the tasks stored in the given files, ordered by creation time."""
+        tasks = []
+        
+        for file in files:
+            task = self._load_cached(self.tasks_dir / file)
+            if task is not None:
+                tasks.append(task)
+        
+        tasks.sort(key=_created_at)
+        return tasks
+    
+    def save(self, task: Task) -> None:
+        """Save a task to storage and index it."""
+        super().save(task)
+        
+        # The signature recorded by the write, without stat'ing the file again
+        file = self._get_task_path(task.name).name
+        with self._conn:
+            self._index_task(file, task, self._file_cache[file][0])
+    
+    def save_many(self, tasks: Iterable[Task]) -> None:
+        """Save several tasks durably and index them in one transaction."""
+        tasks = list(tasks)
+        super().save_many(tasks)
+        
+        with self._conn:
+            for task in tasks:
+                file = self._get_task_path(task.name).name
+                self._index_task(file, task, self._file_cache[file][0])
+    
+    def delete(self, name: str) -> bool:
+        """Delete a task from storage and the index."""
+        if not super().delete(name):
+            return False
+        
+        with self._conn:
+            self._unindex_task(self._get_task_path(name).name)
+        return True
+    
+    def list_enabled(self) -> list[Task]:
+        """List all enabled tasks."""
+        self._sync_index()
+        rows = self._conn.execute("SELECT file FROM tasks WHERE enabled = 1")
+        return self._load_files([file for (file,) in rows])
+    
+    def find_by_tag(self, tag: str) -> list[Task]:
+        """Find tasks by tag."""
+        self._sync_index()
+        rows = self._conn.execute("SELECT file FROM task_tags WHERE tag = ?", (tag,))
+        return self._load_files([file for (file,) in rows])
+    
+    def names(self) -> list[str]:
+        """Names of all stored tasks, read from the index."""
+        self._sync_index()
+        return [name for (name,) in self._conn.execute("SELECT name FROM tasks")]
+    
+    def find_by_owner(self, owner: str) -> list[Task]:
+        """Find tasks by owner."""
+        self._sync_index()
+        rows = self._conn.execute("SELECT file FROM tasks WHERE owner = ?", (owner,))
+        return self._load_files([file for (file,) in rows])
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get storage statistics from the index, without parsing task files."""
+        self._sync_index()
+        total, enabled, runs, failures = self._conn.execute(
+            "SELECT COUNT(*), TOTAL(enabled), TOTAL(run_count), TOTAL(fail_count) FROM tasks"
+        ).fetchone()
+        
+        return {
+            "total_tasks": total,
+            "enabled_tasks": int(enabled),
+            "disabled_tasks": total - int(enabled),
+            "total_runs": int(runs),
+            "total_failures": int(failures),
+            "data_dir": str(self.data_dir),
+        }
+
+
+@lru_cache(maxsize=None)
+def get_storage() -> TaskStorage:
+    """Get the process-wide storage for the default data directory."""
+    return TaskStorage()
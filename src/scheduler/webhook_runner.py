@@ -1,13 +1,17 @@
-"""Webhook runner - sends webhook notifications in background."""
+"""Webhook runner - sends a webhook notification described by the environment.
+
+The daemon delivers webhooks in-process (see scheduler.webhooks); this module
+remains as a command-line entry point for external callers.
+"""
 
 from __future__ import annotations
 
-import json
 import logging
 import os
 import sys
 
-logging.basicConfig(level=logging.WARNING)
+from scheduler.jsonutil import loads
+from scheduler.webhooks import send_webhook
 
 
 def main() -> None:
@@ -18,30 +22,16 @@ def main() -> None:
     if not url:
         sys.exit(1)
     
+    # A valid payload is posted as given rather than decoded and re-encoded
     try:
-        payload = json.loads(payload_str)
-    except json.JSONDecodeError:
-        payload = {}
+        loads(payload_str)
+        data = payload_str.encode("utf-8")
+    except ValueError:
+        data = b"{}"
     
-    try:
-        import urllib.request
-        import urllib.error
-        
-        headers = {"Content-Type": "application/json"}
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
-        
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(url, data=data, headers=headers, method="POST")
-        
-        with urllib.request.urlopen(req, timeout=10) as response:
-            if 200 <= response.status < 300:
-                sys.exit(0)
-            else:
-                sys.exit(1)
-    except Exception:
-        sys.exit(1)
+    sys.exit(0 if send_webhook(url, token, data) else 1)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
     main()
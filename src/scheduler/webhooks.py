@@ -0,0 +1,198 @@
+"""In-process webhook delivery for the scheduler daemon."""
+
+from __future__ import annotations
+
+import asyncio
+import http.client
+import logging
+import ssl
+import threading
+import urllib.parse
+import urllib.request
+from typing import Any
+
+from scheduler.jsonutil import dumps
+
+logger = logging.getLogger(__name__)
+
+# Deliveries waiting beyond this are dropped rather than held in memory
+DEFAULT_QUEUE_SIZE = 1000
+# Idle keep-alive connections kept per (scheme, host, port)
+_MAX_IDLE_PER_HOST = 4
+
+
+class _ConnectionPool:
+    """Idle HTTP(S) connections kept open for reuse, safe to share between threads."""
+
+    def __init__(self) -> None:
+        self._idle: dict[tuple[str, str, int | None], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context: ssl.SSLContext | None = None
+
+    def acquire(
+        self, key: tuple[str, str, int | None], timeout: float
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        """Get a connection for key and whether it was reused from the pool."""
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+
+        if conn is not None:
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+
+        scheme, host, port = key
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            conn = http.client.HTTPSConnection(
+                host, port, timeout=timeout, context=self._ssl_context
+            )
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        return conn, False
+
+    def release(self, key: tuple[str, str, int | None], conn: http.client.HTTPConnection) -> None:
+        """Return a connection whose response has been fully read."""
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < _MAX_IDLE_PER_HOST:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+_pool = _ConnectionPool()
+
+
+def _uses_proxy(parts: urllib.parse.SplitResult) -> bool:
+    """Whether urllib would send this URL through a configured proxy."""
+    proxies = urllib.request.getproxies()
+    return parts.scheme in proxies and not urllib.request.proxy_bypass(parts.netloc)
+
+
+def _post_keepalive(
+    parts: urllib.parse.SplitResult,
+    data: bytes,
+    headers: dict[str, str],
+    timeout: float,
+) -> int:
+    """POST over a pooled keep-alive connection, returning the status code."""
+    key = (parts.scheme, parts.hostname or "", parts.port)
+    path = parts.path or "/"
+    if parts.query:
+        path += f"?{parts.query}"
+
+    while True:
+        conn, reused = _pool.acquire(key, timeout)
+        try:
+            conn.request("POST", path, body=data, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            # The server may have dropped an idle connection; retry once on a new one
+            if reused:
+                continue
+            raise
+
+        if response.will_close:
+            conn.close()
+        else:
+            _pool.release(key, conn)
+        return response.status
+
+
+def send_webhook(
+    url: str,
+    token: str,
+    payload: dict[str, Any] | bytes,
+    timeout: float = 10,
+) -> bool:
+    """POST a JSON payload (a dict, or already encoded) to a webhook URL.
+    
+    Returns True on a 2xx response.
+    """
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+
+    data = payload if isinstance(payload, bytes) else dumps(payload)
+    parts = urllib.parse.urlsplit(url)
+
+    try:
+        if parts.scheme in ("http", "https") and not _uses_proxy(parts):
+            status = _post_keepalive(parts, data, headers, timeout)
+        else:
+            req = urllib.request.Request(url, data=data, headers=headers, method="POST")
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                status = response.status
+        return 200 <= status < 300
+    except Exception as e:
+        logger.warning(f"Webhook delivery to {url} failed: {e}")
+        return False
+
+
+class WebhookDispatcher:
+    """Delivers webhooks from a bounded queue drained by one background task."""
+
+    def __init__(self, maxsize: int = DEFAULT_QUEUE_SIZE) -> None:
+        """Create a dispatcher whose queue holds at most maxsize pending webhooks."""
+        self.maxsize = maxsize
+        self._queue: asyncio.Queue[tuple[str, str, dict[str, Any]]] | None = None
+        self._worker: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def submit(self, url: str, token: str, payload: dict[str, Any]) -> bool:
+        """Queue a delivery from the running loop; False if the queue is full."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue(self.maxsize)
+            self._worker = loop.create_task(self._run(self._queue))
+
+        try:
+            self._queue.put_nowait((url, token, payload))
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def join(self, timeout: float | None = None) -> None:
+        """Wait until queued deliveries have been attempted."""
+        if self._queue is None or self._loop is not asyncio.get_running_loop():
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Dropping {self._queue.qsize()} undelivered webhooks")
+
+    def close(self) -> None:
+        """Stop the worker and close pooled keep-alive connections."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        _pool.close()
+
+    async def _run(self, queue: asyncio.Queue[tuple[str, str, dict[str, Any]]]) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            url, token, payload = await queue.get()
+            try:
+                # urllib blocks, so the POST runs in the default thread pool
+                await loop.run_in_executor(None, send_webhook, url, token, payload)
+            finally:
+                queue.task_done()
+
+
+dispatcher = WebhookDispatcher()
@@ -0,0 +1,11 @@
+"""Shared test fixtures."""
+
+import pytest
+
+from scheduler.storage import TaskStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """A TaskStorage over a fresh temporary data directory."""
+    return TaskStorage(tmp_path)
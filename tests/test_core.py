@@ -0,0 +1,175 @@
+"""Tests for the scheduler core."""
+
+import asyncio
+import heapq
+import time
+from datetime import datetime
+
+from scheduler.core import Scheduler
+from scheduler.executor import ExecutionResult, TaskExecutor
+from scheduler.models import Task, TaskStatus
+from scheduler.storage import TaskStorage
+
+
+class RecordingExecutor(TaskExecutor):
+    """Executor that records which tasks started instead of running commands."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = []
+
+    async def execute(self, task, run):
+        self.started.append(task.name)
+        run.status = TaskStatus.SUCCESS
+        run.exit_code = 0
+        run.finished_at = datetime.now()
+        return ExecutionResult(success=True, exit_code=0, stdout="", stderr="")
+
+
+def make_scheduler(tmp_path):
+    executor = RecordingExecutor()
+    return Scheduler(TaskStorage(tmp_path), executor), executor
+
+
+async def run_due(scheduler):
+    await scheduler._check_and_run_tasks()
+    await asyncio.gather(*scheduler._tasks.values())
+
+
+class TestScheduler:
+    async def test_dispatches_due_tasks_in_fire_order(self, tmp_path):
+        scheduler, executor = make_scheduler(tmp_path)
+        last_run = datetime(2020, 1, 1, 10, 0)
+        # Next fires: hourly at 11:00, every five minutes at 10:05
+        scheduler.storage.save(
+            Task(name="hourly", cron="0 * * * *", command="cmd", last_run=last_run)
+        )
+        scheduler.storage.save(
+            Task(name="five", cron="*/5 * * * *", command="cmd", last_run=last_run)
+        )
+
+        await run_due(scheduler)
+
+        assert executor.started == ["five", "hourly"]
+
+    async def test_reschedules_after_run(self, tmp_path):
+        scheduler, executor = make_scheduler(tmp_path)
+        scheduler.storage.save(
+            Task(name="t", cron="* * * * *", command="cmd", last_run=datetime(2020, 1, 1))
+        )
+
+        await run_due(scheduler)
+
+        assert executor.started == ["t"]
+        assert [name for _, name in scheduler._heap] == ["t"]
+        assert scheduler._heap[0][0] > time.time()
+        assert scheduler.storage.load("t").run_count == 1
+
+    async def test_own_save_does_not_rebuild_heap(self, tmp_path, monkeypatch):
+        scheduler, executor = make_scheduler(tmp_path)
+        scheduler.storage.save(
+            Task(name="t", cron="* * * * *", command="cmd", last_run=datetime(2020, 1, 1))
+        )
+        await run_due(scheduler)
+
+        def fail():
+            raise AssertionError("heap rebuilt")
+
+        monkeypatch.setattr(scheduler.storage, "list_enabled", fail)
+        scheduler._sync_schedule()
+
+        assert [name for _, name in scheduler._heap] == ["t"]
+
+    async def test_reschedules_when_save_fails(self, tmp_path, monkeypatch):
+        scheduler, executor = make_scheduler(tmp_path)
+        scheduler.storage.save(
+            Task(name="t", cron="* * * * *", command="cmd", last_run=datetime(2020, 1, 1))
+        )
+        scheduler._sync_schedule()
+
+        def fail(task):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(scheduler.storage, "save", fail)
+        await run_due(scheduler)
+
+        assert executor.started == ["t"]
+        assert [name for _, name in scheduler._heap] == ["t"]
+        assert scheduler._heap[0][0] > time.time()
+
+    async def test_run_does_not_modify_listed_task(self, tmp_path):
+        scheduler, executor = make_scheduler(tmp_path)
+        scheduler.storage.save(
+            Task(name="t", cron="* * * * *", command="cmd", last_run=datetime(2020, 1, 1))
+        )
+        listed = scheduler.storage.list_all()[0]
+
+        await run_due(scheduler)
+
+        assert executor.started == ["t"]
+        assert listed.run_count == 0
+        assert scheduler.storage.list_all()[0].run_count == 1
+
+    async def test_skips_stale_heap_entries(self, tmp_path):
+        scheduler, executor = make_scheduler(tmp_path)
+        scheduler.storage.save(
+            Task(name="yearly", cron="0 0 1 1 *", command="cmd", last_run=datetime.now())
+        )
+        scheduler._sync_schedule()
+
+        # Left behind by a removed task and by a reschedule to a later time
+        heapq.heappush(scheduler._heap, (0.0, "removed"))
+        heapq.heappush(scheduler._heap, (0.0, "yearly"))
+        await run_due(scheduler)
+
+        assert executor.started == []
+        assert [name for _, name in scheduler._heap] == ["yearly"]
+
+    async def test_reload_task(self, tmp_path):
+        scheduler, executor = make_scheduler(tmp_path)
+        storage = scheduler.storage
+        storage.save(Task(name="t", cron="0 0 1 1 *", command="cmd", last_run=datetime.now()))
+        scheduler._sync_schedule()
+        assert executor.started == []
+
+        storage.save(
+            Task(name="t", cron="* * * * *", command="cmd", last_run=datetime(2020, 1, 1))
+        )
+        scheduler.reload_task("t")
+        assert scheduler._scheduled["t"].cron == "* * * * *"
+
+        await run_due(scheduler)
+        assert executor.started == ["t"]
+
+        storage.delete("t")
+        scheduler.reload_task("t")
+        assert "t" not in scheduler._scheduled
+
+    async def test_sees_edits_from_other_instance(self, tmp_path):
+        scheduler, executor = make_scheduler(tmp_path)
+        scheduler.storage.save(Task(name="t", cron="* * * * *", command="cmd"))
+        scheduler._sync_schedule()
+        assert "t" in scheduler._scheduled
+
+        TaskStorage(tmp_path).save(
+            Task(name="t", cron="* * * * *", command="cmd", enabled=False)
+        )
+        scheduler._sync_schedule()
+        # Storage is only rescanned once per check_interval
+        assert "t" in scheduler._scheduled
+
+        scheduler._last_refresh -= scheduler.check_interval
+        scheduler._sync_schedule()
+        assert "t" not in scheduler._scheduled
+
+    def test_created_outside_event_loop(self, tmp_path):
+        scheduler = Scheduler(TaskStorage(tmp_path), RecordingExecutor(), check_interval=5)
+
+        async def main():
+            loop_task = asyncio.ensure_future(scheduler.start())
+            await asyncio.sleep(0.05)
+            scheduler.stop()
+            scheduler.resume()
+            await asyncio.wait_for(loop_task, 1)
+
+        asyncio.run(main())
@@ -0,0 +1,97 @@
+"""Tests for the plain cron expression fast path."""
+
+import pytest
+from datetime import datetime, timedelta
+
+from croniter import croniter
+
+from scheduler.cron_canon import canonicalize
+from scheduler.cronexpr import matches, next_fire, parse_cron
+
+
+def mask(values):
+    return sum(1 << v for v in values)
+
+
+class TestParseCron:
+    def test_expands_fields(self):
+        fields = parse_cron("*/15 9-17 * * 1-5")
+        
+        assert fields is not None
+        assert fields.minutes == mask({0, 15, 30, 45})
+        assert fields.hours == mask(range(9, 18))
+        assert fields.weekdays == mask({1, 2, 3, 4, 5})
+        assert fields.day_or is False
+    
+    def test_sunday_as_seven(self):
+        assert parse_cron("0 0 * * 7").weekdays == mask({0})
+    
+    @pytest.mark.parametrize("expr", [
+        "0 0 L * *",
+        "0 0 * * MON",
+        "0 0 15W * *",
+        "0 0 * * 5#2",
+        "0 0 * * * *",
+        "60 * * * *",
+        "@daily",
+    ])
+    def test_unsupported_expressions(self, expr):
+        assert parse_cron(expr) is None
+
+
+class TestNextFire:
+    @pytest.mark.parametrize("expr", [
+        "* * * * *",
+        "*/5 * * * *",
+        "0 2 * * *",
+        "0 0 1 1 *",
+        "15 10 * * 1-5",
+        "0 0 13 * 5",
+        "0 0 29 2 *",
+        "5/15 9-17/2 * * *",
+        "30 4 1,15 * 5",
+        "0 0 */2 * 1",
+        "0 0 */2 * 0-6",
+        "0 0 1-31/2 * 0-6",
+        "0 0 27-28 * */6",
+        "5/1 * * * *",
+        "0 3/1 * * *",
+        "0/1 0 * * *",
+    ])
+    def test_agrees_with_croniter(self, expr):
+        fields = parse_cron(expr)
+        base = datetime(2023, 12, 31, 23, 59, 30)
+        
+        for _ in range(50):
+            expected = croniter(expr, base).get_next(datetime)
+            assert next_fire(fields, base) == expected
+            assert matches(fields, expected)
+            base = expected + timedelta(seconds=17)
+    
+    def test_impossible_date(self):
+        assert next_fire(parse_cron("0 0 31 2 *"), datetime(2024, 1, 1)) is None
+
+
+class TestCanonicalize:
+    @pytest.mark.parametrize("expr, expected", [
+        ("0,15,30,45 * * * *", "0,15,30,45 * * * *"),
+        ("*/15 * * * *", "0,15,30,45 * * * *"),
+        ("0   2 * * *", "0 2 * * *"),
+        ("0 0 * * 7", "0 0 * * 0"),
+        ("0 0 * * 3,5,1-4,2,2", "0 0 * * 1-5"),
+        ("0 0 1-31 * *", "0 0 * * *"),
+        ("*/1 * * 1-12 0-6", "* * * * *"),
+        ("5/1 * * * *", "5-59 * * * *"),
+        ("0 22/1 * * *", "0 22,23 * * *"),
+    ])
+    def test_equivalent_forms(self, expr, expected):
+        assert canonicalize(expr) == expected
+    
+    def test_keeps_restricted_day_fields(self):
+        # "every day of month OR Monday" is not the same as "Mondays"
+        assert canonicalize("0 0 1-31 * 1") == "0 0 1-31 * 1"
+        # A full day-of-week next to "*/2" reads as "*", so the days are AND-ed
+        assert canonicalize("0 0 */2 * 0-6") == canonicalize("0 0 */2 * *")
+    
+    def test_unsupported_expression_unchanged(self):
+        assert canonicalize("0  0 L * *") == "0 0 L * *"
@@ -0,0 +1,34 @@
+"""Tests for the daemon PID file."""
+
+import os
+
+import pytest
+
+from scheduler import daemon
+
+
+@pytest.fixture
+def pid_file(tmp_path, monkeypatch):
+    path = tmp_path / "scheduler.pid"
+    monkeypatch.setattr(daemon, "PID_FILE", path)
+    return path
+
+
+class TestPidFile:
+    def test_write_and_read(self, pid_file):
+        daemon.write_pid()
+        assert daemon.read_pid() == os.getpid()
+
+        daemon.remove_pid()
+        assert daemon.read_pid() is None
+
+    def test_invalid_pid_file(self, pid_file):
+        pid_file.write_text("not-a-pid")
+        assert daemon.read_pid() is None
+
+    def test_recycled_pid(self, pid_file):
+        if daemon.psutil is None:
+            pytest.skip("psutil is not installed")
+
+        pid_file.write_text(f"{os.getpid()}\n0.0")
+        assert daemon.read_pid() is None
@@ -0,0 +1,78 @@
+"""Tests for shell command execution."""
+
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+from scheduler import executor
+from scheduler.config import MAX_OUTPUT_CHARS, RETRY_MAX_DELAY
+from scheduler.executor import TaskExecutor, execute_command, retry_delay
+from scheduler.models import RetryPolicy, Task, TaskRun, TaskStatus
+
+
+class TestExecuteCommand:
+    async def test_captures_output(self):
+        result = await execute_command("echo hello; echo oops >&2; exit 3")
+
+        assert not result.success
+        assert result.exit_code == 3
+        assert result.stdout == "hello\n"
+        assert result.stderr == "oops\n"
+
+    async def test_environment_overrides(self, monkeypatch):
+        monkeypatch.setattr(executor, "_BASE_ENV", {"BASE": "1", "PATH": os.environ["PATH"]})
+        result = await execute_command('echo "$BASE $EXTRA"', env={"EXTRA": "2"})
+
+        assert result.stdout == "1 2\n"
+
+    async def test_invalid_utf8_is_replaced(self):
+        result = await execute_command("printf 'ok\\377\\n'")
+
+        assert result.success
+        assert result.stdout == "ok\ufffd\n"
+
+    async def test_large_output_is_capped(self):
+        size = MAX_OUTPUT_CHARS * 20
+        result = await execute_command(
+            f"{sys.executable} -c \"import sys; sys.stdout.write('x' * {size})\""
+        )
+
+        assert result.success
+        assert result.stdout.startswith("x" * MAX_OUTPUT_CHARS + "\n... ")
+        assert result.stdout.endswith(f"({size - MAX_OUTPUT_CHARS} chars truncated)")
+
+    async def test_timeout(self):
+        result = await execute_command("sleep 5", timeout=1)
+
+        assert result.exit_code == -1
+        assert "timed out" in result.stderr
+
+
+class TestRetryDelay:
+    def test_doubles_up_to_cap(self):
+        delays = [retry_delay(10, attempt) for attempt in range(1, 12)]
+
+        assert 10 <= delays[0] <= 11
+        assert 20 <= delays[1] <= 21
+        assert RETRY_MAX_DELAY <= delays[-1] <= RETRY_MAX_DELAY + 1
+
+    def test_cap_never_below_base(self):
+        assert retry_delay(RETRY_MAX_DELAY * 2, 3) >= RETRY_MAX_DELAY * 2
+
+
+class TestTaskExecutor:
+    def test_retries_with_executor_created_outside_loop(self):
+        executor = TaskExecutor(max_retrying=1)
+        task = Task(
+            name="t",
+            cron="* * * * *",
+            command="exit 1",
+            retry=RetryPolicy(max_attempts=2, delay=0),
+        )
+        run = TaskRun(started_at=datetime.now(), status=TaskStatus.RUNNING)
+
+        result = asyncio.run(executor.execute(task, run))
+
+        assert not result.success
+        assert run.attempt == 2
@@ -0,0 +1,53 @@
+"""Tests for the MCP server result cache."""
+
+from datetime import datetime, timedelta
+
+from scheduler.mcp_server import ResultCache, _cache_key
+from scheduler.models import Task
+from scheduler.storage import TaskStorage
+
+
+class TestResultCache:
+    def test_hit_returns_same_body_and_etag(self):
+        cache = ResultCache()
+        body, etag = cache.put("key", [{"name": "a", "next_run": None}])
+
+        assert cache.get("key") == (body, etag)
+        assert cache.get("other") is None
+
+    def test_expires_at_earliest_next_run(self):
+        cache = ResultCache()
+        past = (datetime.now() - timedelta(seconds=1)).isoformat()
+        future = (datetime.now() + timedelta(hours=1)).isoformat()
+
+        cache.put("due", [{"next_run": future}, {"next_run": past}])
+        cache.put("later", {"next_run": future})
+
+        assert cache.get("due") is None
+        assert cache.get("later") is not None
+
+    def test_evicts_least_recently_used(self):
+        cache = ResultCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+
+
+class TestCacheKey:
+    def test_changes_when_task_file_is_edited(self, tmp_path):
+        storage = TaskStorage(tmp_path)
+        storage.save(Task(name="x", cron="* * * * *", command="cmd"))
+        key = _cache_key("get_task", {"name": "x"}, storage)
+        assert _cache_key("get_task", {"name": "x"}, storage) == key
+
+        TaskStorage(tmp_path).save(Task(name="x", cron="* * * * *", command="cmd", enabled=False))
+        storage.refresh()
+
+        assert _cache_key("get_task", {"name": "x"}, storage) != key
+
+    def test_uncacheable_method(self, tmp_path):
+        assert _cache_key("add_task", {}, TaskStorage(tmp_path)) is None
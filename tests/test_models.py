@@ -44,6 +44,9 @@ class TestTask:
         
         decoded = task.get_environment_decoded()
         assert decoded["SECRET"] == "my-secret"
+        
+        task.add_environment_encoded("SECRET", "rotated", encode=True)
+        assert task.get_environment_decoded()["SECRET"] == "rotated"
     
     def test_frontmatter_roundtrip(self):
         task = Task(
@@ -68,6 +71,113 @@ class TestTask:
         assert task2.command == task.command
         assert task2.priority == 8
         assert task2.owner == "admin"
+    
+    def test_next_run_persisted(self):
+        task = Task(name="test", cron="0 2 * * *", command="cmd")
+        assert "next_run" not in task.to_frontmatter().metadata
+        assert task.next_run_at is None
+        
+        next_run = task.get_next_run()
+        post = task.to_frontmatter()
+        assert post.metadata["next_run"] == next_run.isoformat()
+        
+        task2 = Task.from_frontmatter(post)
+        assert task2.next_run_at == task.get_next_run()
+        assert task2.get_next_run() == task.get_next_run()
+    
+    def test_stale_next_run_recomputed(self):
+        task = Task(
+            name="test",
+            cron="0 2 * * *",
+            command="cmd",
+            next_run_at=datetime(2000, 1, 1, 2, 0),
+        )
+        
+        assert task.get_next_run() > datetime.now()
+    
+    def test_next_run_recomputed_after_cron_edit(self):
+        task = Task(name="test", cron="0 0 1 1 *", command="cmd")
+        task.get_next_run()
+        post = task.to_frontmatter()
+        
+        # A hand edit changes the cron but leaves the stored next_run behind
+        post.metadata["cron"] = "0 * * * *"
+        task2 = Task.from_frontmatter(post)
+        
+        assert task2.get_next_run() == Task(name="t", cron="0 * * * *", command="c").get_next_run()
+    
+    def test_effective_cron(self):
+        task = Task(name="test", cron="@daily", command="cmd")
+        assert task.effective_cron == "0 0 * * *"
+        
+        task.cron = "*/30 * * * *"
+        assert task.effective_cron == "0,30 * * * *"
+    
+    def test_to_dict_refreshed_after_run(self):
+        task = Task(name="test", cron="* * * * *", command="cmd")
+        first = task.to_dict()
+        assert task.to_dict() == first
+        assert task.to_dict() is not first
+        
+        task.add_run(TaskRun(started_at=datetime.now(), exit_code=0, status=TaskStatus.SUCCESS))
+        assert task.next_run_at > task.last_run
+        assert task.to_dict()["run_count"] == 1
+        assert task.to_dict()["last_status"] == "success"
+    
+    def test_to_dict_refreshed_after_field_assignment(self):
+        task = Task(name="test", cron="* * * * *", command="echo 1")
+        task.to_dict()
+        
+        task.command = "echo 2"
+        task.tags = ["z"]
+        
+        assert task.to_dict()["command"] == "echo 2"
+        assert task.to_dict()["tags"] == ["z"]
+    
+    def test_environment_refreshed_after_assignment(self):
+        task = Task(name="test", cron="* * * * *", command="cmd", environment={"A": "1"})
+        assert task.get_environment_decoded() == {"A": "1"}
+        
+        task.environment = {"A": "2"}
+        assert task.get_environment_decoded() == {"A": "2"}
+    
+    def test_history_roundtrip_keeps_newest(self):
+        task = Task(name="test", cron="* * * * *", command="cmd", max_history=3)
+        
+        for minute in range(5):
+            task.add_run(TaskRun(started_at=datetime(2024, 1, 1, 0, minute), exit_code=0))
+        
+        assert [r.started_at.minute for r in task.runs] == [2, 3, 4]
+        
+        task2 = Task.from_frontmatter(task.to_frontmatter())
+        assert [r.started_at.minute for r in task2.runs] == [2, 3, 4]
+        
+        task2.add_run(TaskRun(started_at=datetime(2024, 1, 1, 0, 5), exit_code=0))
+        assert task2.runs[-1].started_at.minute == 5
+    
+    def test_history_output_with_pipes(self):
+        task = Task(name="test", cron="* * * * *", command="cmd")
+        task.add_run(TaskRun(started_at=datetime(2024, 1, 1), exit_code=1, stdout="a | b\nc |"))
+        
+        run = Task.from_frontmatter(task.to_frontmatter()).runs[-1]
+        assert run.stdout == "a | b c |"
+        assert run.exit_code == 1
+        assert run.webhook_called is False
+    
+    def test_parse_legacy_history_table(self):
+        content = (
+            "## Execution History\n\n"
+            "| 执行时间 | 退出码 | 输出 |\n"
+            "|----------|--------|------|\n"
+            "| 2025-03-23 02:00:05 | 0 | Backup \\| done |\n"
+            "| 2025-03-22 02:00:05 | - |  |\n"
+        )
+        
+        runs = Task._parse_execution_history(content)
+        assert [(r.started_at.day, r.exit_code, r.stdout) for r in runs] == [
+            (22, None, ""),
+            (23, 0, "Backup | done"),
+        ]
 
 
 class TestRetryPolicy:
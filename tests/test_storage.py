@@ -1,20 +1,26 @@
 """Tests for scheduler storage."""
 
+import os
+
 import pytest
+from datetime import datetime
 from pathlib import Path
 
 from scheduler.models import Task, RetryPolicy
-from scheduler.storage import TaskStorage
+from scheduler.storage import TaskStorage, SqliteIndexedStorage
 
 
 class TestTaskStorage:
-    def test_storage_initialization(self, tmp_path):
-        storage = TaskStorage(tmp_path)
+    def test_storage_initialization(self, storage):
         assert storage.tasks_dir.exists()
     
-    def test_save_and_load(self, tmp_path):
-        storage = TaskStorage(tmp_path)
+    def test_data_dir_resolution(self, tmp_path, monkeypatch):
+        assert TaskStorage(tmp_path).data_dir == tmp_path.resolve()
         
+        monkeypatch.chdir(tmp_path)
+        assert TaskStorage("data").data_dir == (tmp_path / "data").resolve()
+    
+    def test_save_and_load(self, storage):
         task = Task(
             name="test-task",
             cron="0 2 * * *",
@@ -28,9 +34,33 @@ class TestTaskStorage:
         assert loaded.name == "test-task"
         assert loaded.cron == "0 2 * * *"
     
-    def test_delete(self, tmp_path):
-        storage = TaskStorage(tmp_path)
+    def test_failed_save_keeps_previous_file(self, storage, tmp_path, monkeypatch):
+        storage.save(Task(name="test", cron="* * * * *", command="old"))
+        
+        def fail(src, dst):
+            raise OSError("disk full")
+        
+        monkeypatch.setattr("scheduler.storage.os.replace", fail)
+        with pytest.raises(OSError):
+            storage.save(Task(name="test", cron="* * * * *", command="new"))
+        
+        assert [p.name for p in storage.tasks_dir.iterdir()] == ["test.md"]
+        assert TaskStorage(tmp_path).load("test").command == "old"
+    
+    def test_save_many(self, storage, tmp_path):
+        storage.list_all()
+        storage.save_many(
+            Task(name=f"task{i}", cron="* * * * *", command="cmd", tags=["bulk"])
+            for i in range(3)
+        )
         
+        assert len(storage.find_by_tag("bulk")) == 3
+        assert sorted(TaskStorage(tmp_path).names()) == ["task0", "task1", "task2"]
+        assert sorted(p.name for p in storage.tasks_dir.iterdir()) == [
+            "task0.md", "task1.md", "task2.md"
+        ]
+    
+    def test_delete(self, storage):
         task = Task(name="test", cron="* * * * *", command="cmd")
         storage.save(task)
         assert storage.exists("test")
@@ -38,9 +68,7 @@ class TestTaskStorage:
         storage.delete("test")
         assert not storage.exists("test")
     
-    def test_list_all(self, tmp_path):
-        storage = TaskStorage(tmp_path)
-        
+    def test_list_all(self, storage):
         for i in range(3):
             task = Task(name=f"task{i}", cron="* * * * *", command="cmd")
             storage.save(task)
@@ -48,9 +76,29 @@ class TestTaskStorage:
         tasks = storage.list_all()
         assert len(tasks) == 3
     
-    def test_find_by_tag(self, tmp_path):
-        storage = TaskStorage(tmp_path)
+    def test_list_all_limit(self, storage):
+        for i in range(5):
+            created_at = datetime(2024, 1, 5 - i)
+            task = Task(name=f"task{i}", cron="* * * * *", command="cmd", created_at=created_at)
+            storage.save(task)
         
+        assert [t.name for t in storage.list_all(limit=2)] == ["task4", "task3"]
+        assert len(storage.list_all(limit=10)) == 5
+        assert storage.list_all(limit=0) == []
+    
+    def test_list_all_order_follows_writes(self, storage):
+        storage.save(Task(name="b", cron="* * * * *", command="cmd"))
+        assert [t.name for t in storage.list_all()] == ["b"]
+        
+        older = Task(name="a", cron="* * * * *", command="cmd", created_at=datetime(2020, 1, 1))
+        storage.save(older)
+        assert [t.name for t in storage.list_all()] == ["a", "b"]
+        
+        storage.list_all().clear()
+        storage.delete("a")
+        assert [t.name for t in storage.list_all()] == ["b"]
+    
+    def test_find_by_tag(self, storage):
         task1 = Task(name="task1", cron="* * * * *", command="cmd", tags=["backup"])
         task2 = Task(name="task2", cron="* * * * *", command="cmd", tags=["cleanup"])
         
@@ -60,3 +108,234 @@ class TestTaskStorage:
         results = storage.find_by_tag("backup")
         assert len(results) == 1
         assert results[0].name == "task1"
+    
+    def test_names(self, storage):
+        storage.save(Task(name="backup db", cron="* * * * *", command="cmd"))
+        storage.save(Task(name="cleanup", cron="* * * * *", command="cmd"))
+        
+        assert sorted(storage.names()) == ["backup db", "cleanup"]
+    
+    def test_list_enabled(self, storage):
+        storage.save(Task(name="on", cron="* * * * *", command="cmd"))
+        storage.save(Task(name="off", cron="* * * * *", command="cmd", enabled=False))
+        
+        assert [t.name for t in storage.list_enabled()] == ["on"]
+    
+    def test_filters_follow_updates(self, storage):
+        storage.list_all()
+        
+        task = Task(name="task1", cron="* * * * *", command="cmd", tags=["a"], owner="ops")
+        storage.save(task)
+        assert [t.name for t in storage.find_by_tag("a")] == ["task1"]
+        assert [t.name for t in storage.find_by_owner("ops")] == ["task1"]
+        
+        task.tags = ["b"]
+        task.owner = "dev"
+        storage.save(task)
+        assert storage.find_by_tag("a") == []
+        assert storage.find_by_owner("ops") == []
+        assert [t.name for t in storage.find_by_tag("b")] == ["task1"]
+        assert [t.name for t in storage.find_by_owner("dev")] == ["task1"]
+        
+        storage.delete("task1")
+        assert storage.find_by_tag("b") == []
+    
+    def test_get_stats(self, storage):
+        task = Task(name="on", cron="* * * * *", command="cmd", run_count=3, fail_count=1)
+        storage.save(task)
+        storage.save(Task(name="off", cron="* * * * *", command="cmd", enabled=False, run_count=2))
+        
+        stats = storage.get_stats()
+        assert stats["total_tasks"] == 2
+        assert stats["enabled_tasks"] == 1
+        assert stats["disabled_tasks"] == 1
+        assert stats["total_runs"] == 5
+        assert stats["total_failures"] == 1
+        
+        task.run_count += 1
+        task.fail_count += 1
+        storage.save(task)
+        storage.delete("off")
+        
+        stats = storage.get_stats()
+        assert stats["total_tasks"] == 1
+        assert stats["disabled_tasks"] == 0
+        assert stats["total_runs"] == 4
+        assert stats["total_failures"] == 2
+    
+    def test_sees_changes_from_other_instance(self, storage, tmp_path):
+        storage.save(Task(name="task1", cron="* * * * *", command="cmd"))
+        assert len(storage.list_all()) == 1
+        
+        other = TaskStorage(tmp_path)
+        other.save(Task(name="task2", cron="* * * * *", command="cmd"))
+        assert storage.exists("task2")
+        storage.refresh()
+        assert {t.name for t in storage.list_all()} == {"task1", "task2"}
+        
+        other.delete("task1")
+        assert storage.load("task1") is None
+        assert [t.name for t in storage.list_all()] == ["task2"]
+    
+    def test_sees_edits_to_existing_file(self, storage, tmp_path):
+        storage.save(Task(name="x", cron="* * * * *", command="cmd"))
+        storage.save(Task(name="y", cron="* * * * *", command="cmd"))
+        assert [t.name for t in storage.list_enabled()] == ["x", "y"]
+        
+        other = TaskStorage(tmp_path)
+        other.save(Task(name="x", cron="* * * * *", command="cmd", enabled=False))
+        other.save(Task(name="y", cron="* * * * *", command="cmd", enabled=False))
+        
+        # load() checks the one file it reads; refresh() checks them all
+        assert storage.load("x").enabled is False
+        assert [t.name for t in storage.list_enabled()] == ["y"]
+        storage.refresh()
+        assert storage.list_enabled() == []
+    
+    def test_load_returns_copy(self, storage):
+        storage.save(Task(name="t", cron="* * * * *", command="cmd"))
+        
+        storage.load("t").command = "changed"
+        
+        assert storage.load("t").command == "cmd"
+        assert storage.list_all()[0].command == "cmd"
+    
+    def test_saved_task_is_not_shared(self, storage):
+        task = Task(name="t", cron="* * * * *", command="cmd")
+        storage.save(task)
+        
+        task.command = "changed"
+        
+        assert storage.load("t").command == "cmd"
+    
+    def test_refresh_reparses_only_changed_files(self, storage, tmp_path):
+        storage.save(Task(name="task1", cron="* * * * *", command="cmd"))
+        storage.save(Task(name="task2", cron="* * * * *", command="cmd"))
+        task1 = storage.list_all()[0]
+        
+        other = TaskStorage(tmp_path)
+        other.save(Task(name="task2", cron="* * * * *", command="changed"))
+        other.save(Task(name="task3", cron="* * * * *", command="cmd"))
+        storage.refresh()
+        
+        tasks = {t.name: t for t in storage.list_all()}
+        assert tasks["task1"] is task1
+        assert tasks["task2"].command == "changed"
+        assert "task3" in tasks
+    
+    def test_refresh_keeps_own_writes(self, storage):
+        assert storage.list_all() == []
+        storage.save(Task(name="task1", cron="* * * * *", command="cmd"))
+        task1 = storage.list_all()[0]
+        
+        storage.refresh()
+        
+        assert storage.list_all()[0] is task1
+    
+    def test_refresh_reparses_edited_file(self, storage, tmp_path):
+        storage.save(Task(name="task1", cron="* * * * *", command="cmd"))
+        storage.save(Task(name="task2", cron="* * * * *", command="cmd"))
+        task1 = storage.list_all()[0]
+        
+        task_path = tmp_path / "tasks" / "task2.md"
+        task_path.write_text(task_path.read_text().replace("command: cmd", "command: edited"))
+        storage.refresh()
+        
+        tasks = {t.name: t for t in storage.list_all()}
+        assert tasks["task1"] is task1
+        assert tasks["task2"].command == "edited"
+    
+    def test_revision_changes_on_writes(self, storage, tmp_path):
+        storage.list_all()
+        revision = storage.revision
+        storage.refresh()
+        assert storage.revision == revision
+        
+        storage.save(Task(name="task1", cron="* * * * *", command="cmd"))
+        assert storage.revision != revision
+        
+        revision = storage.revision
+        TaskStorage(tmp_path).delete("task1")
+        storage.refresh()
+        assert storage.revision != revision
+
+
+class TestSqliteIndexedStorage:
+    def test_filter_queries(self, tmp_path):
+        storage = SqliteIndexedStorage(tmp_path)
+        
+        storage.save(Task(name="task1", cron="* * * * *", command="cmd", tags=["backup"]))
+        storage.save(Task(name="task2", cron="* * * * *", command="cmd", enabled=False))
+        
+        assert storage.index_path.exists()
+        assert [t.name for t in storage.list_enabled()] == ["task1"]
+        assert [t.name for t in storage.find_by_tag("backup")] == ["task1"]
+        
+        storage.delete("task1")
+        assert storage.list_enabled() == []
+        assert storage.find_by_tag("backup") == []
+        storage.close()
+    
+    def test_reindexes_edit_with_same_mtime(self, tmp_path):
+        storage = SqliteIndexedStorage(tmp_path)
+        storage.save(Task(name="task1", cron="* * * * *", command="cmd", tags=["a"]))
+        assert [t.name for t in storage.find_by_tag("a")] == ["task1"]
+        
+        task_path = tmp_path / "tasks" / "task1.md"
+        mtime_ns = task_path.stat().st_mtime_ns
+        task_path.write_text(task_path.read_text().replace("- a", "- bb"))
+        os.utime(task_path, ns=(mtime_ns, mtime_ns))
+        
+        assert storage.find_by_tag("a") == []
+        assert [t.name for t in storage.find_by_tag("bb")] == ["task1"]
+        storage.close()
+    
+    def test_reconciles_external_writes(self, tmp_path):
+        storage = SqliteIndexedStorage(tmp_path)
+        storage.save(Task(name="task1", cron="* * * * *", command="cmd"))
+        
+        TaskStorage(tmp_path).save(
+            Task(name="task2", cron="* * * * *", command="cmd", tags=["backup"])
+        )
+        
+        assert {t.name for t in storage.list_enabled()} == {"task1", "task2"}
+        assert [t.name for t in storage.find_by_tag("backup")] == ["task2"]
+        storage.close()
+    
+    def test_owner_and_stats_queries(self, tmp_path):
+        storage = SqliteIndexedStorage(tmp_path)
+        storage.save(Task(name="task1", cron="* * * * *", command="cmd", owner="ops", run_count=3))
+        storage.save(
+            Task(name="task2", cron="* * * * *", command="cmd", enabled=False, fail_count=1)
+        )
+        
+        assert [t.name for t in storage.find_by_owner("ops")] == ["task1"]
+        assert sorted(storage.names()) == ["task1", "task2"]
+        stats = storage.get_stats()
+        assert stats["total_tasks"] == 2
+        assert stats["enabled_tasks"] == 1
+        assert stats["disabled_tasks"] == 1
+        assert stats["total_runs"] == 3
+        assert stats["total_failures"] == 1
+        storage.close()
+    
+    def test_save_many_indexes_tasks(self, tmp_path):
+        storage = SqliteIndexedStorage(tmp_path)
+        storage.save_many([
+            Task(name="task1", cron="* * * * *", command="cmd", owner="ops"),
+            Task(name="task2", cron="* * * * *", command="cmd", owner="ops", enabled=False),
+        ])
+        
+        assert [t.name for t in storage.find_by_owner("ops")] == ["task1", "task2"]
+        assert [t.name for t in storage.list_enabled()] == ["task1"]
+        storage.close()
+    
+    def test_rebuilds_outdated_index(self, tmp_path):
+        storage = SqliteIndexedStorage(tmp_path)
+        storage.save(Task(name="task1", cron="* * * * *", command="cmd", owner="ops"))
+        storage._conn.execute("PRAGMA user_version = 1")
+        storage.close()
+        
+        storage = SqliteIndexedStorage(tmp_path)
+        assert [t.name for t in storage.find_by_owner("ops")] == ["task1"]
+        storage.close()
@@ -0,0 +1,91 @@
+"""Tests for in-process webhook delivery."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from scheduler import webhook_runner, webhooks
+from scheduler.webhooks import WebhookDispatcher, send_webhook
+
+
+@pytest.fixture
+def webhook_server():
+    received = []
+    clients = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            received.append((self.headers.get("Authorization"), json.loads(body)))
+            clients.append(self.client_address)
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/hook", received, clients
+    # Drop pooled keep-alive connections so the single-threaded server can stop
+    webhooks._pool.close()
+    server.shutdown()
+    server.server_close()
+
+
+class TestWebhookDispatcher:
+    async def test_delivers_queued_payloads(self, webhook_server):
+        url, received, _ = webhook_server
+        dispatcher = WebhookDispatcher()
+
+        assert dispatcher.submit(url, "secret", {"task": "a"})
+        assert dispatcher.submit(url, "", {"task": "b"})
+        await dispatcher.join(timeout=5)
+        dispatcher.close()
+
+        assert received == [("Bearer secret", {"task": "a"}), (None, {"task": "b"})]
+
+    async def test_full_queue_rejects(self):
+        dispatcher = WebhookDispatcher(maxsize=1)
+
+        assert dispatcher.submit("http://127.0.0.1:9/", "", {})
+        assert not dispatcher.submit("http://127.0.0.1:9/", "", {})
+
+
+class TestSendWebhook:
+    def test_reuses_connection(self, webhook_server):
+        url, received, clients = webhook_server
+
+        assert send_webhook(url, "", {"n": 1})
+        assert send_webhook(url, "", {"n": 2})
+
+        assert [payload for _, payload in received] == [{"n": 1}, {"n": 2}]
+        assert clients[0] == clients[1]
+
+    def test_encoded_payload(self, webhook_server):
+        url, received, _ = webhook_server
+
+        assert send_webhook(url, "", b'{"n": 1}')
+        assert received == [(None, {"n": 1})]
+
+    def test_unreachable(self):
+        assert not send_webhook("http://127.0.0.1:9/", "", {}, timeout=1)
+
+
+class TestWebhookRunner:
+    def test_posts_payload_from_environment(self, webhook_server, monkeypatch):
+        url, received, _ = webhook_server
+        monkeypatch.setenv("WEBHOOK_URL", url)
+        monkeypatch.setenv("WEBHOOK_TOKEN", "secret")
+        monkeypatch.setenv("WEBHOOK_PAYLOAD", '{"task": "a"}')
+
+        with pytest.raises(SystemExit) as exc:
+            webhook_runner.main()
+
+        assert exc.value.code == 0
+        assert received == [("Bearer secret", {"task": "a"})]